@@ -0,0 +1,34 @@
+## Helpers shared by the test scripts. pytest picks this file up on its own, and the scripts
+## import from it when they're run directly from the repository root.
+from qrgen import QRGenerator
+from qrgen.mask_patterns import apply_mask, condition_1, condition_2, condition_3, condition_4, evaluate_mask
+
+# Old scratch script that calls interleave_blocks with its pre-block-structure signature at import time
+collect_ignore = ['interleaving_test.py']
+
+def placed_symbol(payload, version='auto', ec_level='M', backend='list', **kwargs) -> QRGenerator:
+    """A symbol with its data placed but no mask yet, the grid the mask search scores"""
+    qr = QRGenerator(data=payload, version=version, ec_level=ec_level, grid_backend=backend, **kwargs)
+    qr.add_required_elements()
+    qr.place_data()
+    return qr
+
+def finished_symbol(payload, version='auto', ec_level='M', backend='list', **kwargs) -> QRGenerator:
+    """A symbol with its mask and format info, ready to decode or save"""
+    qr = placed_symbol(payload, version, ec_level, backend, **kwargs)
+    qr.apply_best_mask()
+    qr.add_metadata()
+    return qr
+
+def masked_copy(modules, data_mask, pattern_number: int):
+    masked = [row[:] for row in modules]
+    apply_mask(masked, data_mask, pattern_number)
+    return masked
+
+def reference_breakdown(modules):
+    """(N1, N2, N3, N4) the way mask_patterns.evaluate_mask adds them up"""
+    return condition_1(modules), condition_2(modules), condition_3(modules), condition_4(modules)
+
+def reference_scores(modules, data_mask):
+    """Penalty of every mask, each scored on its own masked copy with evaluate_mask"""
+    return [evaluate_mask(masked_copy(modules, data_mask, k)) for k in range(8)]
@@ -1,3 +1,4 @@
+from argparse import ArgumentParser
 from functools import lru_cache
 from pprint import pprint
 
@@ -90,8 +91,81 @@ def test_generator_polynomials():
 
 required_poly = [7,10,13,15,16,17,18,20,22,24,26,28,30]
 
-if __name__ == "__main__":
+def _hex_literal(data, indent='    ', width=64):
+    # bytes.fromhex(...) literal split over several lines
+    hex_data = data.hex()
+    lines = [f"{indent}'{hex_data[i:i + width]}'" for i in range(0, len(hex_data), width)]
+    return 'bytes.fromhex(\n' + '\n'.join(lines) + f'\n{indent[:-4]})'
+
+def write_tables(filename='qrgen/_tables.py', max_bytes=68):
+    """
+    Write the frozen lookup tables the qrgen package imports at runtime,
+    so nothing has to be computed on startup.
+    """
+    # Only the block table is needed from the package, and that's a plain literal
+    from qrgen.reedsolomon import RS_BLOCK_TABLE, EC_INDEX
+
     calc = GeneratorPolynomialCalculator()
-    polynomials = calc.generate_all_polynomials()
-    polynomials = {k: v for k, v in polynomials.items() if k in required_poly}
-    pprint(polynomials)
\ No newline at end of file
+    gf = calc.gf
+    # Doubled exp table so log sums never need a modulo
+    exp = bytes(gf.exp[i % 255] for i in range(512))
+    log = bytes(gf.log)
+
+    lines = [
+        '# Generated by `python polynomial_bootstrap.py --tables`, do not edit by hand',
+        'from array import array',
+        '',
+        '# GF(256) with the 0x11D polynomial, exp is doubled to 512 entries',
+        f'EXP = {_hex_literal(exp)}',
+        '',
+        f'LOG = {_hex_literal(log)}',
+        '',
+        '# Generator polynomial coefficients in log form, highest degree first',
+        'GENERATOR_LOGS = {',
+    ]
+    for num_error_bytes in range(1, max_bytes + 1):
+        poly = bytes(gf.log[c] for c in calc.generate_generator_polynomial(num_error_bytes))
+        lines.append(f'    {num_error_bytes}: bytes.fromhex({poly.hex()!r}),')
+    lines += [
+        '}',
+        '',
+        '# (version, ec_level): (error correction words per block, data words of every block)',
+        'BLOCK_LAYOUTS = {',
+    ]
+    capacities = {ec_level: [] for ec_level in EC_INDEX}
+    for version in range(1, 41):
+        for ec_level, index in EC_INDEX.items():
+            config = RS_BLOCK_TABLE[(version - 1) * 4 + index]
+            groups = [config[i:i + 3] for i in range(0, len(config), 3)]
+            data_words = bytes(data for count, _, data in groups for _ in range(count))
+            ec_words = groups[0][1] - groups[0][2]
+            if any(total - data != ec_words for _, total, data in groups):
+                raise ValueError(f'Blocks of version {version}-{ec_level} have different EC lengths')
+            capacities[ec_level].append(sum(data_words))
+            lines.append(f'    ({version}, {ec_level!r}): ({ec_words}, {data_words!r}),')
+    lines += [
+        '}',
+        '',
+        '# Data codewords per version (index 0 is version 1) for each EC level',
+        'DATA_CAPACITY = {',
+    ]
+    for ec_level, values in capacities.items():
+        lines.append(f"    {ec_level!r}: array('H', {values}),")
+    lines += ['}', '']
+
+    with open(filename, 'w') as f:
+        f.write('\n'.join(lines))
+    print(f'Wrote {filename}')
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument('--tables', nargs='?', const='qrgen/_tables.py',
+                        help='Write the frozen runtime tables module (default qrgen/_tables.py)')
+    args = parser.parse_args()
+    if args.tables:
+        write_tables(args.tables)
+    else:
+        calc = GeneratorPolynomialCalculator()
+        polynomials = calc.generate_all_polynomials()
+        polynomials = {k: v for k, v in polynomials.items() if k in required_poly}
+        pprint(polynomials)
\ No newline at end of file
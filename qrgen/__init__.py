@@ -6,9 +6,21 @@ from .encoders import (
         NumericEncoder,
         AlphanumericEncoder,
         ByteEncoder,
+        KanjiEncoder,
         BitStream,
+        optimal_segments,
 )
 
+from .structured_append import StructuredAppend
+
+from .serial import generate_range
+
+from .decoder import MatrixDecoder, DecodeError, decode_modules, verify_symbol
+
+from .image_reader import read_image, read_directory
+
+from .mask_selection import ExhaustiveStrategy, BranchAndBoundStrategy, DeadlineStrategy, ReuseStrategy
+
 from .utils import interleave_blocks
 
 from .reedsolomon import *
\ No newline at end of file
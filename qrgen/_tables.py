@@ -0,0 +1,277 @@
+# Generated by `python polynomial_bootstrap.py --tables`, do not edit by hand
+from array import array
+
+# GF(256) with the 0x11D polynomial, exp is doubled to 512 entries
+EXP = bytes.fromhex(
+    '01020408102040801d3a74e8cd8713264c982d5ab475eac98f03060c183060c0'
+    '9d274e9c254a94356ad4b577eec19f23468c050a142850a05dba69d2b96fdea1'
+    '5fbe61c2992f5ebc65ca890f1e3c78f0fde7d3bb6bd6b17ffee1dfa35bb671e2'
+    'd9af4386112244880d1a3468d0bd67ce811f3e7cf8edc7933b76ecc5973366cc'
+    '85172e5cb86ddaa94f9e214284152a54a84d9a2952a455aa49923972e4d5b773'
+    'e6d1bf63c6913f7efce5d7b37bf6f1ffe3dbab4b963162c495376edca557ae41'
+    '82193264c88d070e1c3870e0dda753a651a259b279f2f9efc39b2b56ac458a09'
+    '122448903d7af4f5f7f3fbebcb8b0b162c58b07dfae9cf831b366cd8ad478e01'
+    '020408102040801d3a74e8cd8713264c982d5ab475eac98f03060c183060c09d'
+    '274e9c254a94356ad4b577eec19f23468c050a142850a05dba69d2b96fdea15f'
+    'be61c2992f5ebc65ca890f1e3c78f0fde7d3bb6bd6b17ffee1dfa35bb671e2d9'
+    'af4386112244880d1a3468d0bd67ce811f3e7cf8edc7933b76ecc5973366cc85'
+    '172e5cb86ddaa94f9e214284152a54a84d9a2952a455aa49923972e4d5b773e6'
+    'd1bf63c6913f7efce5d7b37bf6f1ffe3dbab4b963162c495376edca557ae4182'
+    '193264c88d070e1c3870e0dda753a651a259b279f2f9efc39b2b56ac458a0912'
+    '2448903d7af4f5f7f3fbebcb8b0b162c58b07dfae9cf831b366cd8ad478e0102'
+)
+
+LOG = bytes.fromhex(
+    '0000011902321ac603df33ee1b68c74b0464e00e348def811cc169f8c8084c71'
+    '058a652fe1240f2135938edaf01282451db5c27d6a27f9b9c99a09784de472a6'
+    '06bf8b6266dd30fde29825b31091228836d094ce8f96dbbdf1d2135c83384640'
+    '1e42b6a3c3487e6e6b3a2854fa85ba3dca5e9b9f0a15792b4ed4e5ac73f3a757'
+    '0770c0f78c80630d674adeed31c5fe18e3a5997726b8b47c114492d92320892e'
+    '373fd15b95bccfcd908797b2dcfcbe61f256d3ab142a5d9e843c3953476d41a2'
+    '1f2d43d8b77ba476c41749ec7f0c6ff66ca13b52299d55aafb6086b1bbcc3e5a'
+    'cb595fb09ca9a0510bf516eb7a752cd74faed5e9e6e7ade874d6f4eaa85058af'
+)
+
+# Generator polynomial coefficients in log form, highest degree first
+GENERATOR_LOGS = {
+    1: bytes.fromhex('0000'),
+    2: bytes.fromhex('001901'),
+    3: bytes.fromhex('00c6c703'),
+    4: bytes.fromhex('004bf94e06'),
+    5: bytes.fromhex('0071a4a6770a'),
+    6: bytes.fromhex('00a6008605b00f'),
+    7: bytes.fromhex('0057e59295ee6615'),
+    8: bytes.fromhex('00afeed0f9d7fcc41c'),
+    9: bytes.fromhex('005ff689e7eb950b7b24'),
+    10: bytes.fromhex('00fb432e3d7646405e202d'),
+    11: bytes.fromhex('00dcc05bc2acb1d174e30a37'),
+    12: bytes.fromhex('00662b6279bb71c68f83579d42'),
+    13: bytes.fromhex('004a98b06456646a6882dace8c4e'),
+    14: bytes.fromhex('00c7f99b30be7cda89d857cf3b165b'),
+    15: bytes.fromhex('0008b73d5bca25333a3aed8c7c056369'),
+    16: bytes.fromhex('0078686b6d66a14c035bbf93a9b6c2e178'),
+    17: bytes.fromhex('002b8bce4e2bef7bced69318639627f3a388'),
+    18: bytes.fromhex('00d7ea9e5eb86176aa4fbb9894fcb305626099'),
+    19: bytes.fromhex('0043036999345a5311969f2c809985fcde8adcab'),
+    20: bytes.fromhex('00113c4f323da31abbcab4dde153ef9ca4d4d4bcbe'),
+    21: bytes.fromhex('00f0e968f7b58c436255c8d2739489e6247afe94afd2'),
+    22: bytes.fromhex('00d2abf7f25de60e6ddd35c84a08ac6250db86a069a5e7'),
+    23: bytes.fromhex('00ab66925b31674111c1960e19b7f85ea4e0c0014e3893fd'),
+    24: bytes.fromhex('00e5798730d375fb7e9fb4a998c0e2e4da6f0075e85760e315'),
+    25: bytes.fromhex('00e7b59c27aa1a0c3b0f94c93642edd063a790b65ff381b2fc2d'),
+    26: bytes.fromhex('00ad7d9e0267b6761191c96f1ca535a115f58e0d6630e39991da46'),
+    27: bytes.fromhex('004fe408a5e315b41d09ed46632d3a8a87497eac5ed8c19d1a119560'),
+    28: bytes.fromhex('00a8dfc868e0ea6cb46ebec393cd1be8c9152bf5572ac3d477f225097b'),
+    29: bytes.fromhex('009c2db71d97db3660f9188805f1afbd1c4bea96941709caa244fa8c1897'),
+    30: bytes.fromhex('0029ad9198d81fb3b632306e56ef60de7d2aade2c1e0829c25fbd8ee28c0b4'),
+    31: bytes.fromhex('001425fc5d3f4be11f735371272c497a89767790f8f83701e1697bb775bbc8d2'),
+    32: bytes.fromhex('000a066abef9a70443d18a8a20f27b591b78b9509c2645ab3c1cde5034feb9dcf1'),
+    33: bytes.fromhex('00f5e73718474e4c51e1d4ad25d72e77e5f5a77e48b55ea5d2627d9fb8a9e8b9e712'),
+    34: bytes.fromhex('006f4d925e1a156c13695e71c1568ca37d3a9ee5efda673846723db781a70d623e8133'),
+    35: bytes.fromhex('00075e8f51f77fcacac27d921d8aa29941697a74ee1a24d8707de40f3108a21e7e6f3a55'),
+    36: bytes.fromhex('00c8b76210ac1ff6ea3c987300a79871f8ee6b123fda2557d269b1784a79c475fb71e91e78'),
+    37: bytes.fromhex('009a4b8db43da568e82ee360b25c8739a278c2d4aefcb72a239d6f178564086925c0bd9f139c'),
+    38: bytes.fromhex('009f2226e4e63bf35f31dab0a414412d6f2751317671dec1faf2a8d929a4f7b11eee1278993cc1'),
+    39: bytes.fromhex('0051d8ae2fc8963b9c598f59a6b7aa9815a5b17184ea059a447cafc49df9e9531899f17e247413e7'),
+    40: bytes.fromhex('003b744fa1fc6280cd80a1f739a338eb6a351abbaee268aa07af23b57258292fa37d864814e835230f'),
+    41: bytes.fromhex('0084a7348bb8df955cfa1253217f6dc207d3f26d4256a95760bb9f72ac76d0b7c852b3262722f28e9337'),
+    42: bytes.fromhex('00fa67dde6191289e700033af2ddbf6e54e608bc6a60930f838b2265df2765d5c7edfec97baba2c2753260'),
+    43: bytes.fromhex('00604303f5d9d72141f06d903f158326659980371fed035ea014574d38bf7bcf4b52007a846591d70f79c08a'),
+    44: bytes.fromhex('00be073d7947f64537a8bc59f3bf19487b09910ef701ee2c4e8f3ee07e767244a334c2d993cca92582716649b5'),
+    45: bytes.fromhex('0006ac48fa12ababa2e5bbef04bb0b25e46648661621495f6384010f590470825fd3ebe33a235884172ca536bbe1'),
+    46: bytes.fromhex('00705e5870fde0ca73bb6359053671812c3a1087d8a9d3240104603cf14968ea08f9f577ae34199de02bcadf13520f'),
+    47: bytes.fromhex('004ca4e55c4fa8db6e6815dc4a13c7c3645dbf2bd548388aa17dbb77fabd89be4c7ef75d1e84063ad5d0a5e098855b3d'),
+    48: bytes.fromhex('00e419c482d3923c18fb5a2766f03db23f2e7b7312dd6f87a0b6cd6bce5f9678b85b15f79c8ceebf0b5ee35432a327226c'),
+    49: bytes.fromhex('00ac790129c1deed406db53478d4e2eff5d014f622e1cc86657dce458afa004d3a8fb9dcfed2be70585b395a6d050db5199c'),
+    50: bytes.fromhex('00e87d9da1a409762ed163cbc12303d16fc3f2cbe12e0d20a07ed182a0f2d7f24b4d2abd2071417c45e472ebaf7caad7e885cd'),
+    51: bytes.fromhex('00d5a68e2b0ad88da3acb46646593ede3e2ad297a3da464d27a6bf72caf5bcb7dd4bd41bed7fcceb3ebee8122eab0f62f742a300'),
+    52: bytes.fromhex('00743256ba32dcfb59c02e567f7c13b8e997d7160e3b9125f2cb86fe59be5e3b417c7164e9eb79164c566127f2c8dc6521effe7433'),
+    53: bytes.fromhex('007ad6e788c70b06cd7c48d575bb3c93c9494b2192abf776d09db1cbeb532de2cae5a80739edebc87c6afea50e9300392a1fb2d5ad67'),
+    54: bytes.fromhex('00b71ac957d2dd71152e412d32eeb8f9e1663ad1da6da51a5fb8c034f523feeeafac4f7b197a2b786cd75080c9eb08993b651fc64c1f9c'),
+    55: bytes.fromhex('0026c57ba71057b2eee36194f71a5ae4b6ecc52ff924d53671b54ab1cc9b3d2f2a008490fbc826268a362c401316ce100ae4d3a1ab2cc2d2'),
+    56: bytes.fromhex('006a786b9da4d87074025bf8a324c9cae50690fe9b87d0aad10c8b7f8eb6f9b1aebe1c0a55efb8657c98ce6017a33d1bc4f7979acacf143d0a'),
+    57: bytes.fromhex('003a8ced5d6a3dc1025749c2d79fa30a9b0579993bf80475163cb1902c48e43e0113aa719e19afc78b5a01d207779a599f827a2e93be875e4442'),
+    58: bytes.fromhex('0052741af7421b3e6bfcb6c8b9eb37fbf2d2909aedb08dc0f898f9ce55fd8e41a57d17181e7af0d60681da1d917f86cef5751d293f9f8ee97d947b'),
+    59: bytes.fromhex('003973e80bc3d903ce4d431da6b46a76cb114598d54a2c312b623dfd7a0e2bd18f09686babe039fefbe2e8ddc2f075a152b2f6b2213256d7efb4b4b5'),
+    60: bytes.fromhex('006b8c1a0c098df3c5e2c5db2dd365db781cb57f0664f702cdc63973db656da0522526ee31a0d179560b7c1eb55419c2574166bedc461bd110590721f0'),
+    61: bytes.fromhex('00a1f469734009ddec1091942290ba0d14fef62623ca4804d49fd3a587fcfa19571e78e2ea5cc748079bdae72c7db29cae7c2b641f3865cc40afe1a9922d'),
+    62: bytes.fromhex('0041ca716247dff876d65e007a251702e43a790769874ef376464cdf594832466fc211d47eb523dd75eb0be595937bd5287306c8641af6b6da7fd724ba6e6a'),
+    63: bytes.fromhex('001e47244713c3ac6e3d02a9c25a883bb6e7916627aae7d643c4cf3570f65a5a79b7924a4d265916e73738f270d96e7b3ec9d980a53cb525a1f684f6127388a8'),
+    64: bytes.fromhex('002d33af09079e9f3144775c7bb1ccbbfec84e8d95771a7f35a05dc7d41d18919cd096dad104d85b2fb8922f8cc3c37df2ee3f636c8ce6f21fcc0bb2f3d99cd5e7'),
+    65: bytes.fromhex('00899ef7f025eed68063da2e8ac6805cdb6d8ba61942430e3aee95b1c3dd9aab30500c3bbee41337d05c70e5253c0a2f5100c025abaf938049a63d950c185f467128'),
+    66: bytes.fromhex('000576deb48888a2332e750dd751118bf7c5ab5fad4189b2446f5f652948d6a9c55f072c9a4d6fec28798f3f5750fdf07ed94d22e86a32a8524c92436aab19845d2d69'),
+    67: bytes.fromhex('00bfac715607a6f6b99bfa62715956d6e19cbe3a219043b3a3349ae99768fba07eafd0e146e39204988b67196b3dcc9ffac1e169a062a7023510f253d2c467f856d329ab'),
+    68: bytes.fromhex('00f79fdf21e05d4d465aa020fe2b965465becd85343ccaa5dccb975d540f54fdada059e334c7615fe734b1297d89f1a6e17602362052d7afc62beeeb1b65b87f030508a3ee'),
+}
+
+# (version, ec_level): (error correction words per block, data words of every block)
+BLOCK_LAYOUTS = {
+    (1, 'L'): (7, b'\x13'),
+    (1, 'M'): (10, b'\x10'),
+    (1, 'Q'): (13, b'\r'),
+    (1, 'H'): (17, b'\t'),
+    (2, 'L'): (10, b'"'),
+    (2, 'M'): (16, b'\x1c'),
+    (2, 'Q'): (22, b'\x16'),
+    (2, 'H'): (28, b'\x10'),
+    (3, 'L'): (15, b'7'),
+    (3, 'M'): (26, b','),
+    (3, 'Q'): (18, b'\x11\x11'),
+    (3, 'H'): (22, b'\r\r'),
+    (4, 'L'): (20, b'P'),
+    (4, 'M'): (18, b'  '),
+    (4, 'Q'): (26, b'\x18\x18'),
+    (4, 'H'): (16, b'\t\t\t\t'),
+    (5, 'L'): (26, b'l'),
+    (5, 'M'): (24, b'++'),
+    (5, 'Q'): (18, b'\x0f\x0f\x10\x10'),
+    (5, 'H'): (22, b'\x0b\x0b\x0c\x0c'),
+    (6, 'L'): (18, b'DD'),
+    (6, 'M'): (16, b'\x1b\x1b\x1b\x1b'),
+    (6, 'Q'): (24, b'\x13\x13\x13\x13'),
+    (6, 'H'): (28, b'\x0f\x0f\x0f\x0f'),
+    (7, 'L'): (20, b'NN'),
+    (7, 'M'): (18, b'\x1f\x1f\x1f\x1f'),
+    (7, 'Q'): (18, b'\x0e\x0e\x0f\x0f\x0f\x0f'),
+    (7, 'H'): (26, b'\r\r\r\r\x0e'),
+    (8, 'L'): (24, b'aa'),
+    (8, 'M'): (22, b"&&''"),
+    (8, 'Q'): (22, b'\x12\x12\x12\x12\x13\x13'),
+    (8, 'H'): (26, b'\x0e\x0e\x0e\x0e\x0f\x0f'),
+    (9, 'L'): (30, b'tt'),
+    (9, 'M'): (22, b'$$$%%'),
+    (9, 'Q'): (20, b'\x10\x10\x10\x10\x11\x11\x11\x11'),
+    (9, 'H'): (24, b'\x0c\x0c\x0c\x0c\r\r\r\r'),
+    (10, 'L'): (18, b'DDEE'),
+    (10, 'M'): (26, b'++++,'),
+    (10, 'Q'): (24, b'\x13\x13\x13\x13\x13\x13\x14\x14'),
+    (10, 'H'): (28, b'\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10'),
+    (11, 'L'): (20, b'QQQQ'),
+    (11, 'M'): (30, b'23333'),
+    (11, 'Q'): (28, b'\x16\x16\x16\x16\x17\x17\x17\x17'),
+    (11, 'H'): (24, b'\x0c\x0c\x0c\r\r\r\r\r\r\r\r'),
+    (12, 'L'): (24, b'\\\\]]'),
+    (12, 'M'): (22, b'$$$$$$%%'),
+    (12, 'Q'): (26, b'\x14\x14\x14\x14\x15\x15\x15\x15\x15\x15'),
+    (12, 'H'): (28, b'\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0f\x0f\x0f\x0f'),
+    (13, 'L'): (26, b'kkkk'),
+    (13, 'M'): (22, b'%%%%%%%%&'),
+    (13, 'Q'): (24, b'\x14\x14\x14\x14\x14\x14\x14\x14\x15\x15\x15\x15'),
+    (13, 'H'): (22, b'\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0b\x0c\x0c\x0c\x0c'),
+    (14, 'L'): (30, b'ssst'),
+    (14, 'M'): (24, b'(((()))))'),
+    (14, 'Q'): (20, b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x11\x11\x11\x11\x11'),
+    (14, 'H'): (24, b'\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\r\r\r\r\r'),
+    (15, 'L'): (22, b'WWWWWX'),
+    (15, 'M'): (24, b')))))*****'),
+    (15, 'Q'): (30, b'\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19'),
+    (15, 'H'): (24, b'\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\x0c\r\r\r\r\r\r\r'),
+    (16, 'L'): (24, b'bbbbbc'),
+    (16, 'M'): (28, b'-------...'),
+    (16, 'Q'): (24, b'\x13\x13\x13\x13\x13\x13\x13\x13\x13\x13\x13\x13\x13\x13\x13\x14\x14'),
+    (16, 'H'): (30, b'\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (17, 'L'): (28, b'klllll'),
+    (17, 'M'): (28, b'........../'),
+    (17, 'Q'): (28, b'\x16\x17\x17\x17\x17\x17\x17\x17\x17\x17\x17\x17\x17\x17\x17\x17'),
+    (17, 'H'): (28, b'\x0e\x0e\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f'),
+    (18, 'L'): (30, b'xxxxxy'),
+    (18, 'M'): (26, b'+++++++++,,,,'),
+    (18, 'Q'): (28, b'\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x17'),
+    (18, 'H'): (28, b'\x0e\x0e\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f'),
+    (19, 'L'): (28, b'qqqrrrr'),
+    (19, 'M'): (26, b',,,-----------'),
+    (19, 'Q'): (26, b'\x15\x15\x15\x15\x15\x15\x15\x15\x15\x15\x15\x15\x15\x15\x15\x15\x15\x16\x16\x16\x16'),
+    (19, 'H'): (26, b'\r\r\r\r\r\r\r\r\r\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e\x0e'),
+    (20, 'L'): (28, b'kkklllll'),
+    (20, 'M'): (26, b')))*************'),
+    (20, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19'),
+    (20, 'H'): (28, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (21, 'L'): (28, b'ttttuuuu'),
+    (21, 'M'): (26, b'*****************'),
+    (21, 'Q'): (28, b'\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x17\x17\x17\x17\x17\x17'),
+    (21, 'H'): (30, b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x11\x11\x11\x11\x11\x11'),
+    (22, 'L'): (28, b'ooppppppp'),
+    (22, 'M'): (28, b'.................'),
+    (22, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (22, 'H'): (24, b'\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r\r'),
+    (23, 'L'): (30, b'yyyyzzzzz'),
+    (23, 'M'): (28, b'////00000000000000'),
+    (23, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (23, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (24, 'L'): (30, b'uuuuuuvvvv'),
+    (24, 'M'): (28, b'------..............'),
+    (24, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (24, 'H'): (30, b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x11\x11'),
+    (25, 'L'): (26, b'jjjjjjjjkkkk'),
+    (25, 'M'): (28, b'////////0000000000000'),
+    (25, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (25, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (26, 'L'): (28, b'rrrrrrrrrrss'),
+    (26, 'M'): (28, b'...................////'),
+    (26, 'Q'): (28, b'\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x16\x17\x17\x17\x17\x17\x17'),
+    (26, 'H'): (30, b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x11\x11\x11\x11'),
+    (27, 'L'): (30, b'zzzzzzzz{{{{'),
+    (27, 'M'): (28, b'----------------------...'),
+    (27, 'Q'): (30, b'\x17\x17\x17\x17\x17\x17\x17\x17\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18'),
+    (27, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (28, 'L'): (30, b'uuuvvvvvvvvvv'),
+    (28, 'M'): (28, b'---.......................'),
+    (28, 'Q'): (30, b'\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (28, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (29, 'L'): (30, b'tttttttuuuuuuu'),
+    (29, 'M'): (28, b'---------------------.......'),
+    (29, 'Q'): (30, b'\x17\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18'),
+    (29, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (30, 'L'): (30, b'ssssstttttttttt'),
+    (30, 'M'): (28, b'///////////////////0000000000'),
+    (30, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (30, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (31, 'L'): (30, b'sssssssssssssttt'),
+    (31, 'M'): (28, b'../////////////////////////////'),
+    (31, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19'),
+    (31, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (32, 'L'): (30, b'sssssssssssssssss'),
+    (32, 'M'): (28, b'..........///////////////////////'),
+    (32, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (32, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (33, 'L'): (30, b'ssssssssssssssssst'),
+    (33, 'M'): (28, b'............../////////////////////'),
+    (33, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (33, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (34, 'L'): (30, b'ssssssssssssstttttt'),
+    (34, 'M'): (28, b'..............///////////////////////'),
+    (34, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19'),
+    (34, 'H'): (30, b'\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x11'),
+    (35, 'L'): (30, b'yyyyyyyyyyyyzzzzzzz'),
+    (35, 'M'): (28, b'////////////00000000000000000000000000'),
+    (35, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (35, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (36, 'L'): (30, b'yyyyyyzzzzzzzzzzzzzz'),
+    (36, 'M'): (28, b'//////0000000000000000000000000000000000'),
+    (36, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (36, 'H'): (30, b'\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (37, 'L'): (30, b'zzzzzzzzzzzzzzzzz{{{{'),
+    (37, 'M'): (28, b'.............................//////////////'),
+    (37, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (37, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (38, 'L'): (30, b'zzzz{{{{{{{{{{{{{{{{{{'),
+    (38, 'M'): (28, b'.............////////////////////////////////'),
+    (38, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (38, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (39, 'L'): (30, b'uuuuuuuuuuuuuuuuuuuuvvvv'),
+    (39, 'M'): (28, b'////////////////////////////////////////0000000'),
+    (39, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (39, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+    (40, 'L'): (30, b'vvvvvvvvvvvvvvvvvvvwwwwww'),
+    (40, 'M'): (28, b'//////////////////0000000000000000000000000000000'),
+    (40, 'Q'): (30, b'\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x18\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19\x19'),
+    (40, 'H'): (30, b'\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x0f\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10\x10'),
+}
+
+# Data codewords per version (index 0 is version 1) for each EC level
+DATA_CAPACITY = {
+    'L': array('H', [19, 34, 55, 80, 108, 136, 156, 194, 232, 274, 324, 370, 428, 461, 523, 589, 647, 721, 795, 861, 932, 1006, 1094, 1174, 1276, 1370, 1468, 1531, 1631, 1735, 1843, 1955, 2071, 2191, 2306, 2434, 2566, 2702, 2812, 2956]),
+    'M': array('H', [16, 28, 44, 64, 86, 108, 124, 154, 182, 216, 254, 290, 334, 365, 415, 453, 507, 563, 627, 669, 714, 782, 860, 914, 1000, 1062, 1128, 1193, 1267, 1373, 1455, 1541, 1631, 1725, 1812, 1914, 1992, 2102, 2216, 2334]),
+    'Q': array('H', [13, 22, 34, 48, 62, 76, 88, 110, 132, 154, 180, 206, 244, 261, 295, 325, 367, 397, 445, 485, 512, 568, 614, 664, 718, 754, 808, 871, 911, 985, 1033, 1115, 1171, 1231, 1286, 1354, 1426, 1502, 1582, 1666]),
+    'H': array('H', [9, 16, 26, 36, 46, 60, 66, 86, 100, 122, 140, 158, 180, 197, 223, 253, 283, 313, 341, 385, 406, 442, 464, 514, 538, 596, 628, 661, 701, 745, 793, 845, 901, 961, 986, 1054, 1096, 1142, 1222, 1276]),
+}
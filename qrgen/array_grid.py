@@ -0,0 +1,165 @@
+## NumPy module grid, the optional array backend of QRGenerator.
+## Modules are uint8: 0 light, 1 dark, and 2 on format modules that are still reserved.
+## NumPy is only imported once a grid is created, so importing this module is free.
+from typing import Iterator, List, Tuple
+
+from .utils import load_numpy
+
+# The finder-like pattern condition 3 looks for
+FINDER_LIKE = (1, 0, 1, 1, 1, 0, 1, 0, 0, 0, 0)
+
+def _run_penalties(np, grids):
+    """
+    Condition 1: runs of 5 or more equal modules along the rows, the last run of a row doesn't count.
+    A run of length k >= 5 has k - 4 windows of 5 equal modules, so it costs its windows plus 2.
+    """
+    same = grids[:, :, 1:] == grids[:, :, :-1]
+    # Modules in the last run of their row, i.e. equal to every module after them
+    last_run = np.logical_and.accumulate(same[:, :, ::-1], axis=2)[:, :, ::-1]
+    fives = same[:, :, :-3] & same[:, :, 1:-2] & same[:, :, 2:-1] & same[:, :, 3:]
+    fives &= ~last_run[:, :, :-3]
+    starts = fives.copy()
+    starts[:, :, 1:] &= ~fives[:, :, :-1]
+    return np.count_nonzero(fives, axis=(1, 2)) + 2 * np.count_nonzero(starts, axis=(1, 2))
+
+def _block_penalties(np, grids):
+    """Condition 2: 2x2 blocks of equal modules"""
+    corner = grids[:, :-1, :-1]
+    same = (corner == grids[:, :-1, 1:]) & (corner == grids[:, 1:, :-1]) & (corner == grids[:, 1:, 1:])
+    return 3 * np.count_nonzero(same, axis=(1, 2))
+
+def _finder_penalties(np, grids):
+    """Condition 3: 1:1:3:1:1:4 patterns in rows and columns"""
+    size = grids.shape[2]
+    total = 0
+    for lines in (grids, grids.swapaxes(1, 2)):
+        matches = lines[:, :, :size - 10] == FINDER_LIKE[0]
+        for offset, value in enumerate(FINDER_LIKE[1:], 1):
+            matches &= lines[:, :, offset:size - 10 + offset] == value
+        total = total + np.count_nonzero(matches, axis=(1, 2))
+    return 40 * total
+
+def _balance_penalty(dark_count: int, size: int) -> int:
+    """Condition 4: distance of the dark module ratio from 50%. Like evaluate_mask, 2 counts as dark"""
+    ratio = dark_count / (size ** 2)
+    ratio = int(abs(ratio - 0.5) * 100)
+    return ratio // 5 * 10
+
+def penalty_breakdowns(grids) -> List[Tuple[int, int, int, int]]:
+    """
+    The four mask penalty conditions of a stack of grids, same rules as mask_patterns.evaluate_mask.
+
+    Args:
+        grids: (count, size, size) array, usually the 8 masked candidates of one symbol
+
+    Returns:
+        List of (N1, N2, N3, N4) per grid
+    """
+    np = load_numpy()
+    size = grids.shape[2]
+    dark_counts = np.count_nonzero(grids, axis=(1, 2)).tolist()
+    return list(zip(_run_penalties(np, grids).tolist(), _block_penalties(np, grids).tolist(),
+                    _finder_penalties(np, grids).tolist(),
+                    [_balance_penalty(dark_count, size) for dark_count in dark_counts]))
+
+def penalty_breakdown(grid) -> Tuple[int, int, int, int]:
+    """The four mask penalty conditions of a single (size, size) grid"""
+    return penalty_breakdowns(grid[None])[0]
+
+class ArrayGrid:
+    """
+    Module grid as a uint8 array, plus a bool plane of the data modules and the
+    (8, size, size) mask planes of the version, both shared with the template.
+    The quiet zone is never stored, it's added when exporting or rendering.
+    """
+    def __init__(self, modules, data, planes):
+        self.modules = modules
+        self.data = data
+        self.planes = planes
+        self.placed = False
+        # Bumped on every write, so exports of the grid know when to rebuild
+        self.changes = 0
+
+    @classmethod
+    def from_template(cls, template) -> 'ArrayGrid':
+        modules, data = template.as_arrays()
+        return cls(modules.copy(), data, template.mask_planes())
+
+    @property
+    def size(self) -> int:
+        return self.modules.shape[0]
+
+    def place(self, table, data_blocks, ec_blocks):
+        """Scatter every codeword bit to its module, see PlacementTable"""
+        np = load_numpy()
+        positions, remainder = table.as_numpy()
+        flat = self.modules.reshape(-1)
+        flat[positions] = np.frombuffer(table.codeword_bits(data_blocks, ec_blocks), dtype=np.uint8)
+        flat[remainder] = 0
+        self.placed = True
+        self.changes += 1
+
+    def apply_mask(self, pattern_number: int):
+        self.modules ^= self.planes[pattern_number]
+        self.changes += 1
+
+    def evaluate_mask(self, pattern_number: int) -> int:
+        """Penalty of the grid with the mask applied, the grid itself is left alone"""
+        return sum(penalty_breakdown(self.modules ^ self.planes[pattern_number]))
+
+    def conditions(self, pattern_number: int) -> Iterator[int]:
+        """The penalty of each condition with a mask applied, cheapest first: N4, N2, N1, N3"""
+        np = load_numpy()
+        candidate = (self.modules ^ self.planes[pattern_number])[None]
+        yield _balance_penalty(int(np.count_nonzero(candidate)), self.size)
+        yield int(_block_penalties(np, candidate)[0])
+        yield int(_run_penalties(np, candidate)[0])
+        yield int(_finder_penalties(np, candidate)[0])
+
+    def mask_breakdowns(self) -> List[Tuple[int, int, int, int]]:
+        """(N1, N2, N3, N4) of every mask pattern, all 8 candidates are scored as one stack"""
+        np = load_numpy()
+        return penalty_breakdowns(np.bitwise_xor(self.modules, self.planes))
+
+    def mask_penalties(self) -> List[int]:
+        """Penalty of every mask pattern"""
+        return [sum(breakdown) for breakdown in self.mask_breakdowns()]
+
+    def place_bits(self, positions, bits):
+        """Write bits (booleans) to row-major module indices"""
+        np = load_numpy()
+        self.modules.reshape(-1)[np.asarray(positions, dtype=np.intp)] = np.asarray(bits, dtype=np.uint8)
+        self.changes += 1
+
+    def place_stream(self, order, bits):
+        """
+        Place a raw bit stream on the data modules in placement order, like place_data does
+        for lists and BitStreams. Modules left over once the stream runs out get 0.
+        """
+        np = load_numpy()
+        values = np.zeros(len(order), dtype=np.uint8)
+        count = min(len(order), len(bits))
+        values[:count] = np.asarray(bits[:count], dtype=np.uint8)
+        self.modules.reshape(-1)[np.frombuffer(order, dtype=np.uint16).astype(np.intp)] = values
+        self.placed = True
+        self.changes += 1
+
+    def padded(self, padding: int = 0):
+        np = load_numpy()
+        return np.pad(self.modules, padding) if padding else self.modules
+
+    def to_list(self, padding: int = 0) -> List[list]:
+        """
+        The grid as a list of lists, like QRGenerator.modules with the list backend.
+        Data modules are None until data has been placed.
+        """
+        np = load_numpy()
+        if self.placed:
+            return self.padded(padding).tolist()
+        modules = self.modules.astype(object)
+        modules[self.data] = None
+        return (np.pad(modules, padding, constant_values=0) if padding else modules).tolist()
+
+    def is_finished(self) -> bool:
+        """Whether every module is light or dark, i.e. nothing is still reserved"""
+        return self.placed and bool((self.modules <= 1).all())
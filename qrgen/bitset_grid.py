@@ -0,0 +1,243 @@
+## Mask scoring on int bitsets, for when NumPy isn't available.
+## Every row and every column is kept as three ints: dark, light and reserved (2) modules.
+## The first module of a line is the most significant bit, so `line << k` moves module j + k onto j.
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .mask_patterns import mask_patterns
+from .mask_selection import MaskScorer, NUM_MASKS
+
+# Module value -> '1' where the module is in the class, '0' elsewhere
+_DARK_DIGITS = bytes.maketrans(b'\x00\x01\x02', b'010')
+_LIGHT_DIGITS = bytes.maketrans(b'\x00\x01\x02', b'100')
+_RESERVED_DIGITS = bytes.maketrans(b'\x00\x01\x02', b'001')
+
+def _line_words(lines) -> Tuple[List[int], List[int], List[int]]:
+    dark, light, reserved = [], [], []
+    for line in lines:
+        line = bytes(line)
+        dark.append(int(line.translate(_DARK_DIGITS), 2))
+        light.append(int(line.translate(_LIGHT_DIGITS), 2))
+        reserved.append(int(line.translate(_RESERVED_DIGITS), 2))
+    return dark, light, reserved
+
+def flip_words(flips: List[List[int]], size: int) -> Tuple[List[int], List[int]]:
+    """
+    Mask words from the columns a mask flips in every row.
+
+    Returns:
+        Tuple of (one word per row, one word per column)
+    """
+    rows = [sum(1 << (size - 1 - j) for j in columns) for columns in flips]
+    columns = [0] * size
+    for i, row in enumerate(flips):
+        for j in row:
+            columns[j] |= 1 << (size - 1 - i)
+    return rows, columns
+
+def mask_words(data_mask: List[List[bool]], pattern_number: int) -> Tuple[List[int], List[int]]:
+    """Mask words straight from a data mask, SymbolTemplate.mask_words caches them per version"""
+    size = len(data_mask)
+    mask = mask_patterns[pattern_number]
+    return flip_words([[j for j in range(size) if data_mask[i][j] and mask(i, j)] for i in range(size)], size)
+
+def _run_penalty(line: int) -> int:
+    """Condition 1 for one class of one row: every run of 5 or more costs its length - 2"""
+    # The run that reaches the last module isn't counted, clear it
+    lowest_gap = (line + 1) & ~line
+    line &= ~(lowest_gap - 1)
+    # One bit per module that starts 5 in a row, so a run of length k has k - 4 of them
+    fives = line & (line << 1) & (line << 2) & (line << 3) & (line << 4)
+    if not fives:
+        return 0
+    runs = fives & ~(fives >> 1)
+    return fives.bit_count() + 2 * runs.bit_count()
+
+def _row_runs(dark: int, light: int, reserved: int) -> int:
+    """Condition 1 for one row"""
+    return sum(_run_penalty(line) for line in (dark, light, reserved) if line)
+
+def _row_pair_blocks(upper: Tuple[int, int, int], lower: Tuple[int, int, int]) -> int:
+    """Condition 2 blocks between two rows, each given as (dark, light, reserved)"""
+    total = 0
+    for a, b in zip(upper, lower):
+        both = a & b
+        if both:
+            total += (both & (both << 1)).bit_count()
+    return total
+
+def _finder_line(d: int, l: int) -> int:
+    """Condition 3 matches of 1, 0, 1, 1, 1, 0, 1, 0, 0, 0, 0 starting anywhere in one line"""
+    matches = (d & (l << 1) & (d << 2) & (d << 3) & (d << 4) & (l << 5) & (d << 6)
+               & (l << 7) & (l << 8) & (l << 9) & (l << 10))
+    return matches.bit_count()
+
+def _finder_count(dark: List[int], light: List[int]) -> int:
+    return sum(_finder_line(d, l) for d, l in zip(dark, light))
+
+def _balance_penalty(dark_count: int, size: int) -> int:
+    """Condition 4, like evaluate_mask reserved modules count as dark"""
+    ratio = int(abs(dark_count / (size ** 2) - 0.5) * 100)
+    return ratio // 5 * 10
+
+class BitsetGrid:
+    """
+    A module grid of 0, 1 and 2 values (True and False count as 1 and 0) as row and column bitsets.
+    Scores exactly like mask_patterns.evaluate_mask, just without looking at single modules.
+    """
+    def __init__(self, size: int, rows: Tuple[List[int], List[int], List[int]],
+                 columns: Tuple[List[int], List[int], List[int]]):
+        self.size = size
+        self.rows = rows
+        self.columns = columns
+
+    @classmethod
+    def from_modules(cls, modules: List[list]) -> Optional['BitsetGrid']:
+        """None when the grid has other values, e.g. data that hasn't been placed yet"""
+        try:
+            flat = b''.join(map(bytes, modules))
+        except (TypeError, ValueError):
+            return None
+        if flat.translate(None, b'\x00\x01\x02'):
+            return None
+        return cls(len(modules), _line_words(modules), _line_words(zip(*modules)))
+
+    def masked(self, row_words: List[int], column_words: List[int]) -> 'BitsetGrid':
+        """The grid with the mask words XORed in, reserved modules are never part of a mask"""
+        dark, light, reserved = self.rows
+        rows = ([d ^ m for d, m in zip(dark, row_words)], [l ^ m for l, m in zip(light, row_words)], reserved)
+        dark, light, reserved = self.columns
+        columns = ([d ^ m for d, m in zip(dark, column_words)], [l ^ m for l, m in zip(light, column_words)], reserved)
+        return BitsetGrid(self.size, rows, columns)
+
+    def run_penalty(self) -> int:
+        """Condition 1, along the rows only"""
+        return sum(_row_runs(*row) for row in zip(*self.rows))
+
+    def block_penalty(self) -> int:
+        """Condition 2, a 2x2 block is the same class in both rows and in both columns"""
+        rows = list(zip(*self.rows))
+        return 3 * sum(_row_pair_blocks(upper, lower) for upper, lower in zip(rows, rows[1:]))
+
+    def finder_penalty(self) -> int:
+        """Condition 3, rows and columns"""
+        return 40 * (_finder_count(self.rows[0], self.rows[1]) + _finder_count(self.columns[0], self.columns[1]))
+
+    def balance_penalty(self) -> int:
+        """Condition 4"""
+        dark_count = sum(line.bit_count() for line in self.rows[0]) + sum(line.bit_count() for line in self.rows[2])
+        return _balance_penalty(dark_count, self.size)
+
+    def penalty_breakdown(self) -> Tuple[int, int, int, int]:
+        return self.run_penalty(), self.block_penalty(), self.finder_penalty(), self.balance_penalty()
+
+    def conditions(self) -> Iterator[int]:
+        """The penalty of each condition, cheapest first: N4, N2, N1, N3"""
+        yield self.balance_penalty()
+        yield self.block_penalty()
+        yield self.run_penalty()
+        yield self.finder_penalty()
+
+    def penalty(self) -> int:
+        return sum(self.penalty_breakdown())
+
+    def evaluate_mask(self, row_words: List[int], column_words: List[int]) -> int:
+        """Penalty of the grid with the mask words applied, same as evaluate_mask on a masked copy"""
+        return self.masked(row_words, column_words).penalty()
+
+class IncrementalScorer(MaskScorer):
+    """
+    The penalties of all 8 masks of one symbol, kept up to date while data modules change.
+    Every row, pair of rows and column keeps its share of each condition for every mask,
+    so update only has to rescore the lines the changed modules are on.
+
+    Args:
+        grid: The symbol before masking
+        mask_words: Function from mask number to (row words, column words), e.g. SymbolTemplate.mask_words
+    """
+    def __init__(self, grid: BitsetGrid, mask_words: Callable):
+        self.size = size = grid.size
+        # Unmasked modules. Reserved modules never change and are never masked
+        self.rows = (list(grid.rows[0]), list(grid.rows[1]), grid.rows[2])
+        self.columns = (list(grid.columns[0]), list(grid.columns[1]))
+        self.words = [mask_words(k) for k in range(NUM_MASKS)]
+        # Per mask: condition 1 and 3 of every row, dark modules of every row,
+        # condition 2 blocks between row i and i + 1, condition 3 of every column
+        self.row_runs = [[0] * size for _ in range(NUM_MASKS)]
+        self.row_finders = [[0] * size for _ in range(NUM_MASKS)]
+        self.row_darks = [[0] * size for _ in range(NUM_MASKS)]
+        self.row_blocks = [[0] * (size - 1) for _ in range(NUM_MASKS)]
+        self.column_finders = [[0] * size for _ in range(NUM_MASKS)]
+        self._score_rows(range(size))
+        self._score_columns(range(size))
+
+    @classmethod
+    def from_modules(cls, modules: List[list], mask_words: Callable) -> Optional['IncrementalScorer']:
+        """None when the grid has values other than 0, 1 and 2"""
+        grid = BitsetGrid.from_modules(modules)
+        return cls(grid, mask_words) if grid is not None else None
+
+    def _score_rows(self, rows: Iterable[int]):
+        dark, light, reserved = self.rows
+        rows = sorted(set(rows))
+        pairs = sorted({pair for i in rows for pair in (i - 1, i) if 0 <= pair < self.size - 1})
+        for k, (row_words, _) in enumerate(self.words):
+            runs, finders, darks, blocks = self.row_runs[k], self.row_finders[k], self.row_darks[k], self.row_blocks[k]
+            for i in rows:
+                d = dark[i] ^ row_words[i]
+                l = light[i] ^ row_words[i]
+                runs[i] = _row_runs(d, l, reserved[i])
+                finders[i] = _finder_line(d, l)
+                darks[i] = d.bit_count() + reserved[i].bit_count()
+            for i in pairs:
+                upper = (dark[i] ^ row_words[i], light[i] ^ row_words[i], reserved[i])
+                lower = (dark[i + 1] ^ row_words[i + 1], light[i + 1] ^ row_words[i + 1], reserved[i + 1])
+                blocks[i] = _row_pair_blocks(upper, lower)
+
+    def _score_columns(self, columns: Iterable[int]):
+        dark, light = self.columns
+        columns = set(columns)
+        for k, (_, column_words) in enumerate(self.words):
+            finders = self.column_finders[k]
+            for j in columns:
+                finders[j] = _finder_line(dark[j] ^ column_words[j], light[j] ^ column_words[j])
+
+    def update(self, changes: Iterable[Tuple[int, int, int]]):
+        """
+        Set data modules to new values and rescore the lines they're on.
+
+        Args:
+            changes: (row, column, value) of every changed module, value 0 or 1. Only data
+                     modules may change, they're the ones holding 0 or 1 before masking
+        """
+        dark, light, _ = self.rows
+        column_dark, column_light = self.columns
+        top = self.size - 1
+        rows, columns = set(), set()
+        for i, j, value in changes:
+            row_bit = 1 << (top - j)
+            column_bit = 1 << (top - i)
+            if value:
+                dark[i] |= row_bit
+                light[i] &= ~row_bit
+                column_dark[j] |= column_bit
+                column_light[j] &= ~column_bit
+            else:
+                dark[i] &= ~row_bit
+                light[i] |= row_bit
+                column_dark[j] &= ~column_bit
+                column_light[j] |= column_bit
+            rows.add(i)
+            columns.add(j)
+        self._score_rows(rows)
+        self._score_columns(columns)
+
+    def breakdown(self, pattern_number: int) -> Tuple[int, int, int, int]:
+        """(N1, N2, N3, N4) of a mask, the same as mask_patterns.condition_1..4 on the masked grid"""
+        k = pattern_number
+        return (sum(self.row_runs[k]), 3 * sum(self.row_blocks[k]),
+                40 * (sum(self.row_finders[k]) + sum(self.column_finders[k])),
+                _balance_penalty(sum(self.row_darks[k]), self.size))
+
+    def conditions(self, pattern_number: int) -> Iterator[int]:
+        n1, n2, n3, n4 = self.breakdown(pattern_number)
+        return iter((n4, n2, n1, n3))
@@ -0,0 +1,381 @@
+## Reads the payload back out of a finished module grid, so symbols can be checked without a scanner
+from dataclasses import dataclass, field
+from itertools import count
+from operator import itemgetter
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from .encoders import ALPHANUM, SEGMENT_ENCODERS, STRUCTURED_APPEND_MODE, as_bytes
+from .main import QRGenerator, TEMPLATES
+from .mask_patterns import mask_patterns
+from .metadata import QRFormatInfo, QRVersionInfo
+from .reedsolomon import RS_DECODER, QRErrorCorrection
+from .utils import interleave_blocks
+
+# Both format info and version info codes are at least 7 bits apart, so up to 3 flipped bits can be fixed
+MAX_INFO_ERRORS = 3
+
+# Mode indicator -> encoder class, for the character count field sizes
+SEGMENT_MODES = {encoder.MODE: encoder for encoder in SEGMENT_ENCODERS}
+
+# 0/1 bytes -> '0'/'1' characters, to turn a row of modules into an int in one go
+_BIT_CHARS = bytes.maketrans(b'\x00\x01', b'01')
+
+class DecodeError(ValueError):
+    """Raised when a module grid can't be read back"""
+
+class Segment(NamedTuple):
+    mode: int
+    data: Union[str, bytes]
+
+@dataclass
+class DecodedSymbol:
+    version: int
+    ec_level: str
+    mask_pattern: int
+    segments: List[Segment]
+    # (index, total, parity) when the symbol is part of a structured append sequence
+    structured_append: Optional[Tuple[int, int, int]] = None
+    # Number of codewords that had to be corrected
+    corrected: int = 0
+
+    @property
+    def text(self) -> str:
+        """The payload as a string, byte segments are read as utf-8"""
+        return ''.join(
+            segment.data.decode('utf-8') if isinstance(segment.data, bytes) else segment.data
+            for segment in self.segments
+        )
+
+    @property
+    def raw(self) -> bytes:
+        """The payload as bytes, text segments are written as utf-8"""
+        return b''.join(as_bytes(segment.data) for segment in self.segments)
+
+@dataclass
+class SymbolLayout:
+    """Where everything sits in a symbol of one version, built once and shared by every decode"""
+    version: int
+    size: int
+    # Flat (row * size + column) indices of the data modules, in placement order
+    data_positions: List[int]
+    # Both copies of the format info and version info, flat indices in bit order (MSB first)
+    format_positions: Tuple[List[int], List[int]]
+    version_positions: Tuple[List[int], List[int]]
+    # Mask pattern -> int of the mask bits over data_positions
+    masks: List[int] = field(default_factory=list)
+    # EC level -> (QRErrorCorrection, data word order, EC word order), filled in on first use.
+    # The orders give the interleaved position of every word, block after block
+    block_layouts: Dict[str, tuple] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # Gathers every data module of a flat grid in one call
+        self.read_data = itemgetter(*self.data_positions)
+
+def _closest(value: int, codes: Dict, max_errors: int = MAX_INFO_ERRORS):
+    """Key of the code nearest to value, None if every code is more than max_errors bits away"""
+    best, best_distance = None, max_errors + 1
+    for key, code in codes.items():
+        distance = bin(value ^ code).count('1')
+        if distance < best_distance:
+            best, best_distance = key, distance
+    return best
+
+def _strip_quiet_zone(modules):
+    """Drop the light border added by _add_dead_zones, the finder patterns are dark on every edge"""
+    top, bottom = 0, len(modules)
+    while top < bottom and not any(modules[top]):
+        top += 1
+    while bottom > top and not any(modules[bottom - 1]):
+        bottom -= 1
+    rows = modules[top:bottom]
+    left, right = 0, len(rows[0]) if rows else 0
+    while left < right and not any(row[left] for row in rows):
+        left += 1
+    while right > left and not any(row[right - 1] for row in rows):
+        right -= 1
+    if top == 0 and left == 0 and bottom == len(modules) and right == len(modules[0]):
+        return modules
+    return [row[left:right] for row in rows]
+
+def _inverse(permutation: List[int]) -> List[int]:
+    inverse = [0] * len(permutation)
+    for i, j in enumerate(permutation):
+        inverse[j] = i
+    return inverse
+
+def _read_bits(flat, positions) -> int:
+    return int(bytes(map(flat.__getitem__, positions)).translate(_BIT_CHARS), 2)
+
+class MatrixDecoder:
+    """
+    Decodes QRGenerator module grids. Layouts are cached per version and block orders per
+    version and EC level, so decoding many symbols only pays for building them once.
+    """
+    def __init__(self):
+        self.layouts: Dict[int, SymbolLayout] = {}
+
+    def layout(self, version: int) -> SymbolLayout:
+        layout = self.layouts.get(version)
+        if layout is None:
+            layout = self._build_layout(version)
+            self.layouts[version] = layout
+        return layout
+
+    @staticmethod
+    def _build_layout(version: int) -> SymbolLayout:
+        if not 1 <= version <= 40:
+            raise DecodeError(f'Invalid version: {version}')
+        # The generator's own template, so the placement order can't drift from it
+        template = TEMPLATES.get(version)
+        size = template.size
+        data_positions = list(template.data_order)
+        format_positions = tuple(list(cells) for cells in template.format_order)
+        # Same order as _place_version_info
+        version_positions = (
+            [(size - 11 + ymod) * size + x for x in range(6) for ymod in range(3)],
+            [y * size + size - 11 + xmod for y in range(6) for xmod in range(3)],
+        )
+        layout = SymbolLayout(version, size, data_positions, format_positions, version_positions)
+        for mask in mask_patterns:
+            bits = bytes(mask(*divmod(position, size)) for position in data_positions)
+            layout.masks.append(int(bits.translate(_BIT_CHARS), 2))
+        return layout
+
+    def block_layout(self, layout: SymbolLayout, ec_level: str):
+        """QRErrorCorrection for the symbol and where every block's words sit in the interleaved codewords"""
+        cached = layout.block_layouts.get(ec_level)
+        if cached is None:
+            qr_ec = QRErrorCorrection(layout.version, ec_level, backend='python')
+            rs_config = qr_ec.get_raw_block_config(layout.version, ec_level)
+            # Interleave the word indices the same way _prepare_data interleaves the words
+            data_words = sum(block.data_words for block in qr_ec.blocks)
+            index = count()
+            data_blocks = [[next(index) for _ in range(block.data_words)] for block in qr_ec.blocks]
+            ec_blocks = [[next(index) for _ in range(block.total_words - block.data_words)] for block in qr_ec.blocks]
+            data_order = _inverse(interleave_blocks(data_blocks, rs_config))
+            ec_order = _inverse([i - data_words for i in interleave_blocks(ec_blocks, rs_config)])
+            cached = (qr_ec, data_order, ec_order)
+            layout.block_layouts[ec_level] = cached
+        return cached
+
+    def read_format(self, flat, layout: SymbolLayout) -> Tuple[str, int]:
+        """EC level and mask pattern, from whichever format info copy is readable"""
+        copies = [_read_bits(flat, positions) for positions in layout.format_positions]
+        for bits in copies:
+            try:
+                return QRFormatInfo.decode_format_info(bits)
+            except ValueError:
+                pass
+        for bits in copies:
+            key = _closest(bits, QRFormatInfo.FORMAT_INFO)
+            if key is not None:
+                return key
+        raise DecodeError('Format information is unreadable')
+
+    def check_version(self, flat, layout: SymbolLayout):
+        """Versions 7 and up carry their version number, make sure it agrees with the size"""
+        if layout.version < 7:
+            return
+        codes = {version: info[0] for version, info in QRVersionInfo.VERSION_INFO.items()}
+        for positions in layout.version_positions:
+            version = _closest(_read_bits(flat, positions), codes)
+            if version is not None:
+                if version != layout.version:
+                    raise DecodeError(f'Version information says {version}, the size says {layout.version}')
+                return
+        raise DecodeError('Version information is unreadable')
+
+    def decode(self, modules) -> DecodedSymbol:
+        """
+        Decode a finished QRGenerator.modules grid, with or without the quiet zone.
+
+        Returns:
+            DecodedSymbol with the segments, format and structured append header
+
+        Raises:
+            DecodeError: When the grid can't be read
+            ReedSolomonError: When a block has too many errors to correct
+        """
+        modules = _strip_quiet_zone(modules)
+        size = len(modules)
+        version, remainder = divmod(size - 17, 4)
+        if remainder or any(len(row) != size for row in modules):
+            raise DecodeError(f'A {size}x{len(modules[0]) if modules else 0} grid is not a QR code symbol')
+        layout = self.layout(version)
+        try:
+            flat = b''.join(map(bytes, modules))
+        except (TypeError, ValueError):
+            flat = None
+        if flat is None or flat.translate(None, b'\x00\x01'):
+            raise DecodeError('Every module has to be 0 or 1, is the symbol finished?')
+        return self.decode_flat(flat, layout)
+
+    def decode_flat(self, flat: bytes, layout: SymbolLayout) -> DecodedSymbol:
+        """Decode a row-major grid of 0/1 bytes, without the quiet zone"""
+        self.check_version(flat, layout)
+        ec_level, mask_pattern = self.read_format(flat, layout)
+        qr_ec, data_order, ec_order = self.block_layout(layout, ec_level)
+        # Unmask everything in one XOR, then keep the whole codewords and drop the remainder bits
+        num_bits = len(layout.data_positions)
+        bits = int(bytes(layout.read_data(flat)).translate(_BIT_CHARS), 2) ^ layout.masks[mask_pattern]
+        num_words = len(data_order) + len(ec_order)
+        codewords = (bits >> (num_bits - num_words * 8)).to_bytes(num_words, 'big')
+
+        data_blocks, ec_blocks = [], []
+        data_words = itemgetter(*data_order)(codewords)
+        ec_words = itemgetter(*ec_order)(codewords[len(data_order):])
+        data_start = ec_start = 0
+        for block in qr_ec.blocks:
+            ec_count = block.total_words - block.data_words
+            data_blocks.append(list(data_words[data_start:data_start + block.data_words]))
+            ec_blocks.append(list(ec_words[ec_start:ec_start + ec_count]))
+            data_start += block.data_words
+            ec_start += ec_count
+
+        corrected = 0
+        if not qr_ec.verify_data(data_blocks, ec_blocks):
+            for i, (data_block, ec_block) in enumerate(zip(data_blocks, ec_blocks)):
+                codeword = data_block + ec_block
+                fixed = RS_DECODER.decode_block(codeword, len(ec_block))
+                corrected += sum(a != b for a, b in zip(codeword, fixed))
+                data_blocks[i] = fixed[:len(data_block)]
+
+        data = bytes(word for block in data_blocks for word in block)
+        segments, header = parse_segments(data, layout.version)
+        return DecodedSymbol(layout.version, ec_level, mask_pattern, segments, header, corrected)
+
+    def decode_batch(self, grids) -> List[DecodedSymbol]:
+        """Decode many grids, the layouts are shared between all of them"""
+        return [self.decode(modules) for modules in grids]
+
+    def verify_batch(self, symbols) -> List[bool]:
+        """verify for every symbol, the layouts are shared between all of them"""
+        return [self.verify(qr) for qr in symbols]
+
+    def verify(self, qr: QRGenerator) -> bool:
+        """Whether a finished symbol decodes back to its own data, without any corrections"""
+        if not isinstance(qr.data, (str, bytes, bytearray, memoryview)):
+            raise DecodeError('Only symbols made from strings or bytes can be verified')
+        expected = tuple(qr.structured_append) if qr.structured_append is not None else None
+        try:
+            decoded = self.decode(qr.modules)
+            if isinstance(qr.data, str):
+                matches = decoded.text == qr.data
+            else:
+                matches = decoded.raw == bytes(as_bytes(qr.data))
+        except ValueError:      # DecodeError, ReedSolomonError or a bad utf-8 byte segment
+            return False
+        return (matches and not decoded.corrected and decoded.version == qr.version
+                and decoded.ec_level == qr.ec_level and decoded.structured_append == expected)
+
+def parse_segments(data: bytes, version: int) -> Tuple[List[Segment], Optional[Tuple[int, int, int]]]:
+    """
+    Split the data codewords back into mode segments. Reading stops at a 0000 terminator
+    or when fewer than 4 bits are left, like the spec says.
+
+    Returns:
+        Tuple of ([Segment, ...], structured append (index, total, parity) or None)
+    """
+    bits = format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b')
+    end = len(bits)
+    pos = 0
+    segments = []
+    header = None
+    while end - pos >= 4:
+        mode = int(bits[pos:pos + 4], 2)
+        if mode == 0:
+            # Terminator, the rest is zero fill and pad codewords
+            break
+        pos += 4
+        if mode == STRUCTURED_APPEND_MODE:
+            if end - pos < 16:
+                raise DecodeError('Structured append header is cut off')
+            header = (int(bits[pos:pos + 4], 2), int(bits[pos + 4:pos + 8], 2) + 1, int(bits[pos + 8:pos + 16], 2))
+            pos += 16
+            continue
+        encoder = SEGMENT_MODES.get(mode)
+        if encoder is None:
+            raise DecodeError(f'Unknown mode indicator {mode:04b}')
+        count_bits = encoder._size_from_version(version)
+        if end - pos < count_bits:
+            raise DecodeError('Character count is cut off')
+        length = int(bits[pos:pos + count_bits], 2)
+        pos += count_bits
+        if pos + _segment_bits(encoder.MODE, length) > end:
+            raise DecodeError('Segment runs past the end of the data')
+        if encoder.MODE == 1:
+            payload, pos = _read_numeric(bits, pos, length)
+        elif encoder.MODE == 2:
+            payload, pos = _read_alphanumeric(bits, pos, length)
+        elif encoder.MODE == 4:
+            payload = int(bits[pos:pos + length * 8] or '0', 2).to_bytes(length, 'big')
+            pos += length * 8
+        else:
+            payload, pos = _read_kanji(bits, pos, length)
+        segments.append(Segment(mode, payload))
+    return segments, header
+
+def _segment_bits(mode: int, length: int) -> int:
+    """Bits taken by the characters of a segment"""
+    if mode == 1:
+        full, rest = divmod(length, 3)
+        return full * 10 + (3 * rest + 1 if rest else 0)
+    if mode == 2:
+        return length // 2 * 11 + length % 2 * 6
+    return length * (8 if mode == 4 else 13)
+
+def _read_numeric(bits, pos, length):
+    full, rest = divmod(length, 3)
+    digits = []
+    for i in range(pos, pos + full * 10, 10):
+        group = int(bits[i:i + 10], 2)
+        if group >= 1000:
+            raise DecodeError('Invalid numeric group')
+        digits.append(f'{group:03d}')
+    pos += full * 10
+    if rest:
+        width = 3 * rest + 1
+        group = int(bits[pos:pos + width], 2)
+        # 7 bits hold 2 digits and 4 bits 1 digit, anything past 99 or 9 is malformed
+        if group >= 10 ** rest:
+            raise DecodeError('Invalid numeric group')
+        digits.append(f'{group:0{rest}d}')
+        pos += width
+    return ''.join(digits), pos
+
+def _read_alphanumeric(bits, pos, length):
+    pairs, rest = divmod(length, 2)
+    chars = []
+    for i in range(pos, pos + pairs * 11, 11):
+        first, second = divmod(int(bits[i:i + 11], 2), 45)
+        if first >= 45:
+            raise DecodeError('Invalid alphanumeric pair')
+        chars.append(ALPHANUM[first] + ALPHANUM[second])
+    pos += pairs * 11
+    if rest:
+        index = int(bits[pos:pos + 6], 2)
+        if index >= 45:
+            raise DecodeError('Invalid alphanumeric character')
+        chars.append(ALPHANUM[index])
+        pos += 6
+    return ''.join(chars), pos
+
+def _read_kanji(bits, pos, length):
+    sjis = bytearray()
+    for i in range(pos, pos + length * 13, 13):
+        high, low = divmod(int(bits[i:i + 13], 2), 0xC0)
+        code = (high << 8) | low
+        code += 0x8140 if code + 0x8140 <= 0x9FFC else 0xC140
+        sjis += code.to_bytes(2, 'big')
+    return sjis.decode('shift_jis'), pos + length * 13
+
+# Shared so every caller reuses the same layouts
+MATRIX_DECODER = MatrixDecoder()
+
+def decode_modules(modules) -> DecodedSymbol:
+    """Decode a finished QRGenerator.modules grid"""
+    return MATRIX_DECODER.decode(modules)
+
+def verify_symbol(qr: QRGenerator) -> bool:
+    """Whether a finished QRGenerator decodes back to its own data"""
+    return MATRIX_DECODER.verify(qr)
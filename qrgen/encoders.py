@@ -1,28 +1,61 @@
+from .utils import load_numpy
+
 # String serves as our lookup table
 ALPHANUM = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+DIGITS = "0123456789"
+
+# Byte value -> alphanumeric index, used with bytes.translate
+ALPHANUM_TABLE = bytes(ALPHANUM.index(chr(i)) if chr(i) in ALPHANUM else 0xFF for i in range(256))
+# Bit strings for every 11 bit alphanumeric pair and every 10 bit group of 3 digits
+ALPHANUM_PAIR_BITS = [format(i, '011b') for i in range(45 * 45)]
+DIGIT_GROUP_BITS = {f'{i:03d}': format(i, '010b') for i in range(1000)}
+# str.translate tables that delete every valid character
+ALPHANUM_DELETE = str.maketrans('', '', ALPHANUM)
+DIGITS_DELETE = str.maketrans('', '', DIGITS)
+
+def _validate_charset(data, delete_table, mode):
+    # One pass over the whole input, anything left after deleting the charset is invalid
+    leftover = data.translate(delete_table)
+    if leftover:
+        raise ValueError(f'Character {leftover[0]!r} can not be encoded in {mode} mode')
+
+def as_bytes(data):
+    """utf-8 bytes for strings, a flat byte view for any other bytes-like object"""
+    if isinstance(data, str):
+        return data.encode('utf-8')
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    view = memoryview(data)
+    if not view.c_contiguous:
+        # Strided slices can't be cast, copy them out
+        return view.tobytes()
+    return view if view.format == 'B' and view.ndim == 1 else view.cast('B')
 
 # Base Encoder Class to avoid duplicate code
 class BaseEncoder:
     def __init__(self, data):
         self.data = data
+        self.data_length = self._character_count()
         self.mode_indicator = self._create_mode_indicator()
         self.data_blocks = self._create_data_blocks()
-        self.data_length = len(str(data))   # Lenght as a string otherwise numbers don't work
         self.length_bits = None
     
+    def _character_count(self):
+        return len(str(self.data))   # Lenght as a string otherwise numbers don't work
+
     def test_length(self, qr_version):
         return 4 + len(self.data_blocks) + self._size_from_version(qr_version)
     
-    def _size_from_version(self, qr_version):
+    @classmethod
+    def _size_from_version(cls, qr_version):
         if qr_version <= 9:
-            return self.SMALL
+            return cls.SMALL
         elif qr_version <= 26:
-            return self.MEDIUM
+            return cls.MEDIUM
         else:
-            return self.LARGE
+            return cls.LARGE
 
     def encode(self, qr_version=1):
-        self._create_data_blocks()
         self._create_length_bits(qr_version)
         final_stream = BitStream.merge_bitstreams([self.mode_indicator, self.length_bits, self.data_blocks])
         return final_stream
@@ -55,11 +88,17 @@ class AlphanumericEncoder(BaseEncoder):
     MODE = 2
 
     def _create_data_blocks(self):
+        _validate_charset(self.data, ALPHANUM_DELETE, 'alphanumeric')
+        indices = self.data.encode('ascii').translate(ALPHANUM_TABLE)
+        # Pairs of characters take 11 bits
+        bits = ''.join([ALPHANUM_PAIR_BITS[first * 45 + second]
+                        for first, second in zip(indices[0::2], indices[1::2])])
+        if len(indices) % 2:
+            # Odd character out only takes 6 bits
+            bits += format(indices[-1], '06b')
         stream = BitStream()
-        for i in range(0, self.data_length, 2):
-            index1 = ALPHANUM.index(self.data[i])
-            index2 = ALPHANUM.index(self.data[i+1]) if i+1 < self.data_length else 0
-            stream.put(index1 * 45 + index2, 11)
+        if bits:
+            stream.put(int(bits, 2), len(bits))
         return stream
     
 class NumericEncoder(BaseEncoder):
@@ -69,12 +108,17 @@ class NumericEncoder(BaseEncoder):
     MODE = 1
 
     def _create_data_blocks(self):
-        stream = BitStream()
         string_data = str(self.data)
-        for i in range(0, self.data_length, 3):
-            # Ezpz in python because it doesn't encode it with a leading zero in bits
-            num = int(string_data[i:i+3])
-            stream.put(num, 10)
+        _validate_charset(string_data, DIGITS_DELETE, 'numeric')
+        full = len(string_data) - len(string_data) % 3
+        bits = ''.join([DIGIT_GROUP_BITS[string_data[i:i+3]] for i in range(0, full, 3)])
+        if full < len(string_data):
+            # Leftover groups of 2 and 1 digits take 7 and 4 bits
+            group = string_data[full:]
+            bits += format(int(group), f'0{3 * len(group) + 1}b')
+        stream = BitStream()
+        if bits:
+            stream.put(int(bits, 2), len(bits))
         return stream
 
 class ByteEncoder(BaseEncoder):
@@ -83,19 +127,148 @@ class ByteEncoder(BaseEncoder):
     LARGE = 16
     MODE = 4
 
+    def __init__(self, data):
+        # Strings use utf-8 encoding, bytes-like data is used as is without a copy
+        self.raw = as_bytes(data)
+        super().__init__(data)
+
+    def _character_count(self):
+        # The count field holds the number of bytes, not characters
+        return len(self.raw)
+
+    def _create_data_blocks(self):
+        stream = BitStream()
+        stream.put_bytes(self.raw)
+        return stream
+
+class KanjiEncoder(BaseEncoder):
+    SMALL = 8
+    MEDIUM = 10
+    LARGE = 12
+    MODE = 8
+
     def _create_data_blocks(self):
-        # Just use utf-8 encoding
+        # Each Shift JIS double byte character is compacted into 13 bits
         stream = BitStream()
-        utf8_bytes = self.data.encode('utf-8')
-        for byte in utf8_bytes:
-            stream.put(byte, 8)
+        sjis = self.data.encode('shift_jis')
+        for i in range(0, len(sjis), 2):
+            code = (sjis[i] << 8) | sjis[i+1]
+            code -= 0x8140 if code <= 0x9FFC else 0xC140
+            stream.put((code >> 8) * 0xC0 + (code & 0xFF), 13)
         return stream
 
+def is_kanji(char):
+    """Whether a character can be encoded in Kanji mode"""
+    try:
+        sjis = char.encode('shift_jis')
+    except UnicodeEncodeError:
+        return False
+    if len(sjis) != 2:
+        return False
+    code = (sjis[0] << 8) | sjis[1]
+    return 0x8140 <= code <= 0x9FFC or 0xE040 <= code <= 0xEBBF
+
+# Segmentation modes, in order of preference when costs tie
+SEGMENT_ENCODERS = (ByteEncoder, AlphanumericEncoder, NumericEncoder, KanjiEncoder)
+
+def plan_segments(text, qr_version=1):
+    """
+    Split text into the sequence of mode segments with the smallest total bit length,
+    mode indicators and character count fields included.
+    Costs are tracked in sixths of a bit so numeric (10/3) and alphanumeric (11/2)
+    characters stay whole numbers.
+    Nothing is encoded here, so this is cheap to run when only the size matters.
+
+    Returns:
+        Tuple of ([(encoder class, text), ...], total length in bits)
+    """
+    if not isinstance(text, str):
+        # Raw bytes always go in a single byte segment
+        return [(ByteEncoder, text)], 4 + ByteEncoder._size_from_version(qr_version) + 8 * len(as_bytes(text))
+    if not text:
+        return [(ByteEncoder, text)], 4 + ByteEncoder._size_from_version(qr_version)
+    num_modes = len(SEGMENT_ENCODERS)
+    header_costs = [(4 + encoder._size_from_version(qr_version)) * 6 for encoder in SEGMENT_ENCODERS]
+    costs = header_costs[:]
+    char_modes = []
+    for char in text:
+        # Cost of encoding this character in each mode, None where it can't be
+        char_costs = [
+            len(char.encode('utf-8')) * 48,
+            33 if char in ALPHANUM else None,
+            20 if '0' <= char <= '9' else None,
+            78 if is_kanji(char) else None,
+        ]
+        new_costs = [None] * num_modes
+        modes = [None] * num_modes
+        for m in range(num_modes):
+            if char_costs[m] is not None:
+                new_costs[m] = costs[m] + char_costs[m]
+                modes[m] = m
+        # Switching mode after this character means rounding up to a whole bit and a new header
+        for to_mode in range(num_modes):
+            for from_mode in range(num_modes):
+                if new_costs[from_mode] is None:
+                    continue
+                cost = (new_costs[from_mode] + 5) // 6 * 6 + header_costs[to_mode]
+                if new_costs[to_mode] is None or cost < new_costs[to_mode]:
+                    new_costs[to_mode] = cost
+                    modes[to_mode] = from_mode
+        char_modes.append(modes)
+        costs = new_costs
+
+    # Walk back from the cheapest final state to recover each character's mode
+    mode = mode_end = min(range(num_modes), key=lambda m: ((costs[m] + 5) // 6, m))
+    chosen = [0] * len(text)
+    for i in range(len(text) - 1, -1, -1):
+        mode = char_modes[i][mode]
+        chosen[i] = mode
+
+    plan = []
+    start = 0
+    for i in range(1, len(text) + 1):
+        if i == len(text) or chosen[i] != chosen[start]:
+            plan.append((SEGMENT_ENCODERS[chosen[start]], text[start:i]))
+            start = i
+    return plan, (costs[mode_end] + 5) // 6
+
+def optimal_segments(text, qr_version=1):
+    """
+    Returns:
+        List of encoder instances for the cheapest segmentation, one per segment, in order
+    """
+    plan, _ = plan_segments(text, qr_version)
+    return [encoder(segment) for encoder, segment in plan]
+
+# Mode indicator, symbol position, symbol count and parity byte
+STRUCTURED_APPEND_MODE = 3
+STRUCTURED_APPEND_BITS = 4 + 4 + 4 + 8
+
+def structured_append_header(index, total, parity):
+    """
+    Header that goes in front of the data of every symbol in a structured append sequence
+
+    Args:
+        index: Position of this symbol in the sequence, starting at 0
+        total: Number of symbols in the sequence (1-16)
+        parity: XOR of every byte of the complete original data
+    """
+    if not 1 <= total <= 16 or not 0 <= index < total:
+        raise ValueError(f'Invalid structured append position {index} of {total}')
+    stream = BitStream()
+    stream.put(STRUCTURED_APPEND_MODE, 4)
+    stream.put(index, 4)
+    stream.put(total - 1, 4)
+    stream.put(parity, 8)
+    return stream
+
 class BitStream:
     PADDING = [0xEC, 0x11]
 
     def __init__(self):
-        self.buffer = []
+        # Packed bits, MSB first. The last byte doubles as the bit accumulator
+        # and holds the pending bits when length isn't a multiple of 8.
+        self.buffer = bytearray()
         self.length = 0
 
     def __repr__(self):
@@ -109,57 +282,119 @@ class BitStream:
 
     def put(self, num, length):
         # Puts the lenght of bits from number into our sequence
-        for i in range(length):
-            # Take the bit at index i from our number and insert it
-            # put_bit takes boolean values only so convert a bit in position i to bool
-            self.put_bit(((num >> (length - i - 1)) & 1) == 1)
+        if length <= 0:
+            return
+        num &= (1 << length) - 1
+        offset = self.length & 7
+        if offset:
+            # Top up the partially filled last byte first
+            free = 8 - offset
+            if length <= free:
+                self.buffer[-1] |= num << (free - length)
+                self.length += length
+                return
+            length -= free
+            self.buffer[-1] |= num >> length
+            num &= (1 << length) - 1
+            self.length += free
+        # Byte aligned from here, write all the whole bytes in one go
+        full, rest = divmod(length, 8)
+        if full:
+            self.buffer += (num >> rest).to_bytes(full, 'big')
+        if rest:
+            self.buffer.append((num << (8 - rest)) & 0xFF)
+        self.length += length
+
+    def put_bytes(self, data):
+        """Append bytes-like data, a plain slice copy when we're byte aligned"""
+        if self.length & 7:
+            self.put(int.from_bytes(data, 'big'), len(data) * 8)
+        else:
+            self.buffer += data
+            self.length += len(data) * 8
 
     def __len__(self):
         return self.length
 
+    def __bytes__(self):
+        return bytes(self.buffer)
+
+    def __buffer__(self, flags):
+        # Buffer protocol for Python 3.12+, exposes the packed bytes
+        return memoryview(self.buffer)
+
+    def view(self):
+        """
+        Read-only memoryview of the packed bytes, no copy is made.
+        The stream can't grow while the view is alive, release it before writing more.
+        """
+        return memoryview(self.buffer).toreadonly()
+
     def put_bit(self, bit):
-        buf_index = self.length // 8
-        if len(self.buffer) <= buf_index:
+        if self.length & 7 == 0:
             self.buffer.append(0)
         if bit:     # If bit is 'True' insert it at the next position, else skip
-            self.buffer[buf_index] |= 0x80 >> (self.length % 8)
+            self.buffer[-1] |= 0x80 >> (self.length & 7)
         self.length += 1
 
+    def to_int(self):
+        # The whole stream as one big integer, first bit is the most significant
+        return int.from_bytes(self.buffer, 'big') >> (len(self.buffer) * 8 - self.length)
+
     def extend(self, other):
         # Add the bits from another bit stream to this one
-        for i in range(len(other)):
-            self.put_bit(other.get(i))
+        if self.length & 7:
+            # Shift the other stream in at our current bit offset
+            self.put(other.to_int(), other.length)
+        else:
+            self.buffer += other.buffer
+            self.length += other.length
     
-    def _add_terminator_bits(self):
-        """Terminator bits always 0000"""
-        for _ in range(min(4, (8 - (self.length % 8)))):
-            self.put_bit(False)
+    def _add_terminator_bits(self, length):
+        """Terminator bits always 0000, cut short when fewer than 4 bits are left before length"""
+        self.put(0, min(4, length - self.length))
     
     def _pad_codewords(self, num_codewords):
-        for i in range(num_codewords):
-            self.put(BitStream.PADDING[i % 2], 8)
+        self.put_bytes(bytes(BitStream.PADDING * (num_codewords // 2 + 1))[:max(num_codewords, 0)])
     
     def pad_to_length(self, length):
-        # Add terminator bits and pad the codewords
-        self._add_terminator_bits()
+        # Terminator, zero bits up to the next byte boundary, then alternating pad codewords
+        self._add_terminator_bits(length)
+        self.put(0, -self.length % 8)
         self._pad_codewords((length - self.length) // 8)
     
     def to_bool_array(self):
         # Convert the buffer to an array of booleans
-        return [self.get(i) for i in range(self.length)]
+        if self.length == 0:
+            return []
+        return [bit == '1' for bit in format(self.to_int(), f'0{self.length}b')]
+
+    def to_numpy(self):
+        """Unpacked bits as a uint8 NumPy array, one element per bit"""
+        np = load_numpy()
+        if np is None:
+            raise ImportError('to_numpy requires numpy to be installed')
+        return np.unpackbits(np.frombuffer(self.buffer, dtype=np.uint8), count=self.length)
 
     @staticmethod
     def merge_bitstreams(streams):
         # Merge multiple bitstreams into one
         final_stream = BitStream()
+        final_stream.length = sum(len(stream) for stream in streams)
+        if all(len(stream) % 8 == 0 for stream in streams[:-1]):
+            # Everything lines up on byte boundaries, just join the buffers
+            final_stream.buffer = bytearray(b''.join(stream.buffer for stream in streams))
+            return final_stream
+        value = 0
         for stream in streams:
-            final_stream.extend(stream)
+            value = (value << len(stream)) | stream.to_int()
+        num_bytes = (final_stream.length + 7) // 8
+        final_stream.buffer = bytearray((value << (num_bytes * 8 - final_stream.length)).to_bytes(num_bytes, 'big'))
         return final_stream
     
     @staticmethod
     def from_int8_array(array):
         # Convert an array of integers to a bitstream
         stream = BitStream()
-        for byte in array:
-            stream.put(byte, 8)
+        stream.put_bytes(bytes(array))
         return stream
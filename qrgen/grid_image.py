@@ -36,12 +36,28 @@ class GridImage():
                 raise ValueError('Grid is not a square')
     
     def _create_image(self):
+        if hasattr(self.grid, 'ndim'):
+            # NumPy grid. A finished black and white one is scaled up in one resize
+            # instead of drawing every module, anything else is drawn like a list grid
+            if self.mapping is GridImage.default_mapping and self.grid.max(initial=0) <= 1:
+                return self._create_array_image()
+            return self._draw_image(self.grid.tolist())
+        return self._draw_image(self.grid)
+
+    def _create_array_image(self):
+        pixels = ((1 - self.grid) * 255).astype('uint8')
+        image = Image.fromarray(pixels, 'L')
+        if self.module_size != 1:
+            image = image.resize((image.width * self.module_size, image.height * self.module_size), Image.NEAREST)
+        return image.convert('RGB')
+
+    def _draw_image(self, grid):
         # Creates a PIL image
-        width = height = (self.module_size * len(self.grid))
+        width = height = (self.module_size * len(grid))
         image = Image.new('RGB', (width,height))
         draw = ImageDraw.Draw(image)
         # Iterate through the grid
-        for row_idx, row in enumerate(self.grid):
+        for row_idx, row in enumerate(grid):
             for col_idx, value in enumerate(row):
                 x = col_idx * self.module_size
                 y = row_idx * self.module_size
@@ -62,4 +78,9 @@ class GridImage():
         self.image.save(filename)
     
     def show(self):
-        self.image.show()
\ No newline at end of file
+        self.image.show()
+
+    @classmethod
+    def from_array(cls, grid, module_size=1, **kwargs):
+        """Image of a NumPy module grid, the same as GridImage(grid, module_size)"""
+        return cls(grid, module_size, **kwargs)
@@ -0,0 +1,127 @@
+## Reads our own rendered symbols back from image files, to check the PNGs we actually write.
+## Only handles what GridImage produces: axis aligned, square modules of a whole number of pixels.
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from PIL import Image, ImageChops
+
+from .decoder import MATRIX_DECODER, DecodedSymbol, DecodeError
+
+# Luminance below this is a dark module, the same cut off Pillow uses for mode '1'
+DARK_THRESHOLD = 128
+# Luminance -> 1 for dark modules, 0 for light ones
+_MODULE_BYTES = bytes(1 if i < DARK_THRESHOLD else 0 for i in range(256))
+
+# Rows of a finder pattern, one byte per module
+FINDER_ROWS = (
+    b'\x01\x01\x01\x01\x01\x01\x01',
+    b'\x01\x00\x00\x00\x00\x00\x01',
+    b'\x01\x00\x01\x01\x01\x00\x01',
+    b'\x01\x00\x01\x01\x01\x00\x01',
+    b'\x01\x00\x01\x01\x01\x00\x01',
+    b'\x01\x00\x00\x00\x00\x00\x01',
+    b'\x01\x01\x01\x01\x01\x01\x01',
+)
+
+class ImageResult(NamedTuple):
+    path: str
+    symbol: Optional[DecodedSymbol]
+    error: Optional[Exception]
+
+def _has_finder(flat: bytes, size: int, row: int, column: int) -> bool:
+    return all(
+        flat[(row + i) * size + column:(row + i) * size + column + 7] == finder_row
+        for i, finder_row in enumerate(FINDER_ROWS)
+    )
+
+class ImageReader:
+    """
+    Turns images written by GridImage.save back into module grids and decodes them.
+    The module size is measured from the top left finder pattern, so any scale works.
+    """
+    def __init__(self, decoder=MATRIX_DECODER):
+        self.decoder = decoder
+
+    def read_modules(self, image: Image.Image) -> Tuple[bytes, int]:
+        """
+        Recover the module grid of an image.
+
+        Returns:
+            Tuple of (row-major grid as 0/1 bytes without the quiet zone, modules per side)
+        """
+        gray = image.convert('L')
+        # Without dithering '1' is a plain threshold at DARK_THRESHOLD, inverted the symbol is the bounding box
+        box = ImageChops.invert(gray.convert('1', dither=Image.Dither.NONE)).getbbox()
+        if box is None:
+            raise DecodeError('No dark modules in the image')
+        left, top, right, bottom = box
+        width = right - left
+        if width != bottom - top:
+            raise DecodeError(f'Symbol is not square: {width}x{bottom - top} pixels')
+        # The top edge of the top left finder pattern is 7 dark modules in a row
+        edge = gray.crop((left, top, right, top + 1)).tobytes().translate(_MODULE_BYTES)
+        run = edge.find(0)
+        module_size, rest = divmod(run if run != -1 else width, 7)
+        if rest or not module_size:
+            raise DecodeError('Could not find the top left finder pattern')
+        size, rest = divmod(width, module_size)
+        if rest or size < 21 or (size - 17) % 4:
+            raise DecodeError(f'{width} pixels at {module_size} pixels per module is not a QR code symbol')
+        # Nearest neighbour downscaling samples the centre pixel of every module, all in one pass
+        flat = gray.resize((size, size), Image.NEAREST, box=box).tobytes().translate(_MODULE_BYTES)
+        for row, column in ((0, 0), (0, size - 7), (size - 7, 0)):
+            if not _has_finder(flat, size, row, column):
+                raise DecodeError(f'No finder pattern at module ({row}, {column})')
+        return flat, size
+
+    def read(self, image: Union[str, Path, Image.Image]) -> DecodedSymbol:
+        """Decode an image, or the image file at a path"""
+        if not isinstance(image, Image.Image):
+            with Image.open(image) as opened:
+                return self.read(opened)
+        flat, size = self.read_modules(image)
+        return self.decoder.decode_flat(flat, self.decoder.layout((size - 17) // 4))
+
+    def read_directory(self,
+                       directory: Union[str, Path],
+                       pattern: str = '*.png',
+                       executor: Optional[Executor] = None) -> List[ImageResult]:
+        """
+        Decode every matching image in a directory. Failures are returned, not raised,
+        so one bad image doesn't stop the rest.
+
+        Args:
+            directory: Directory to look in
+            pattern: Glob pattern of the files to read
+            executor: Executor to spread the files over, read in this process when not given.
+                      Workers always use the shared default reader
+
+        Returns:
+            List of ImageResult, in file name order
+        """
+        paths = sorted(str(path) for path in Path(directory).glob(pattern))
+        if executor is not None:
+            return list(executor.map(read_image_result, paths, chunksize=64))
+        return [self._read_result(path) for path in paths]
+
+    def _read_result(self, path: str) -> ImageResult:
+        try:
+            return ImageResult(path, self.read(path), None)
+        except (OSError, ValueError) as error:      # Unreadable file, DecodeError or ReedSolomonError
+            return ImageResult(path, None, error)
+
+IMAGE_READER = ImageReader()
+
+def read_image(image: Union[str, Path, Image.Image]) -> DecodedSymbol:
+    """Decode an image written by GridImage.save"""
+    return IMAGE_READER.read(image)
+
+def read_image_result(path: str) -> ImageResult:
+    # Module level so it can be sent to worker processes
+    return IMAGE_READER._read_result(path)
+
+def read_directory(directory: Union[str, Path], pattern: str = '*.png',
+                   executor: Optional[Executor] = None) -> List[ImageResult]:
+    """Decode every matching image in a directory, see ImageReader.read_directory"""
+    return IMAGE_READER.read_directory(directory, pattern, executor)
@@ -1,46 +1,160 @@
+import warnings
+from array import array
+from functools import partial
 from typing import Union, List
 
 from .utils import get_alignment_pattern_positions, interleave_blocks
-from .encoders import BitStream, ByteEncoder
+from .encoders import BitStream, plan_segments, structured_append_header, STRUCTURED_APPEND_BITS
 from .grid_image import GridImage
-from .mask_patterns import apply_mask, evaluate_mask
-from .reedsolomon import get_codeword_capacity, QRErrorCorrection
+from .mask_patterns import apply_mask
+from .reedsolomon import get_codeword_capacity, smallest_version, QRErrorCorrection, VERSION_CLASSES
 from .metadata import QRFormatInfo, QRVersionInfo
+from .templates import SymbolTemplate, TemplateCache, ROLE_DATA, ROLE_FUNCTION, ROLE_FORMAT, ROLE_VERSION
+from .placement import PlacementCache
+from .array_grid import ArrayGrid
+from .bitset_grid import BitsetGrid, mask_words
+from .mask_selection import MaskChoice, MaskScorer, MaskStrategy, ArrayScorer, BitsetScorer, ListScorer, DEFAULT_STRATEGY
+from .utils import load_numpy
+
+GRID_BACKENDS = ('list', 'numpy', 'auto')
 
 # TODO: This class seems way too big. Should refactor
 class QRGenerator:
     def __init__(self,
-                 data: Union[str, List[BitStream]] = None,
-                 version: int = 1,
+                 data: Union[str, bytes, bytearray, memoryview, List[BitStream]] = None,
+                 version: Union[int, str, None] = 1,
                  ec_level: str = 'L',
                  **kwargs):
         self.version = version
         self.data = data
         self.ec_level = ec_level
+        # (index, total, parity) when this symbol is part of a structured append sequence
+        self.structured_append = kwargs.get('structured_append')
+        # [(encoder class, text), ...] once the segmentation has been planned, see _select_version
+        self.segment_plan = None
+        # version=None or 'auto' picks the smallest version the data fits in
+        self.auto_version = version is None or version == 'auto'
+        if self.auto_version:
+            self.version = self._select_version()
+        # 'list' keeps the grid as a list of lists, 'numpy' as an ArrayGrid,
+        # 'auto' uses NumPy when it's installed
+        self.grid_backend = kwargs.get('grid_backend', 'list')
+        if self.grid_backend not in GRID_BACKENDS:
+            raise ValueError(f'grid_backend must be one of {GRID_BACKENDS}')
+        # ArrayGrid when the NumPy backend is in use, self.modules is then exported from it
+        self.grid = None
         self.modules = None
+        # (data blocks, error correction blocks) once the data has been encoded
+        self.blocks = None
         self.data_mask = None
+        # SymbolTemplate the grid was copied from, None when it was built in place
+        self.template = None
         self.mask_pattern = None
+        # How the mask gets picked, see mask_selection. The last pick is kept in mask_choice
+        self.mask_strategy: MaskStrategy = kwargs.get('mask_strategy') or DEFAULT_STRATEGY
+        self.mask_choice: MaskChoice = None
         self.padding = kwargs.get('padding',4)
         self.padding_flag = False
         self.module_size = kwargs.get('module_size',1)
+        # Shared reedsolomon.PrefixCache for payloads with a common prefix
+        self.prefix_cache = kwargs.get('prefix_cache')
         self.size = None
     
+    @property
+    def modules(self):
+        """
+        The module grid as a list of lists, quiet zone included once it's been added.
+        With the NumPy backend it's an export of self.grid, built again only after the grid
+        changes, so writes to it don't reach the symbol. Edit it and assign it back
+        (qr.modules = grid) to carry on with the list backend, or use modules_view for
+        a read-only view that never copies.
+        """
+        if self.grid is not None:
+            padding = self.padding if self.padding_flag else 0
+            key = (self.grid, self.grid.changes, self.grid.placed, padding)
+            if self._export is None or self._export[0] != key:
+                self._export = (key, self.grid.to_list(padding))
+            return self._export[1]
+        return self._modules
+
+    @modules.setter
+    def modules(self, modules):
+        # Assigning a list of lists switches back to the list backend
+        self.grid = None
+        self._export = None
+        self._modules = modules
+
+    @property
+    def modules_view(self):
+        """
+        Read-only NumPy view of the NumPy backend grid, quiet zone included once it's been added.
+        Writing to it raises ValueError. None with the list backend, use modules there
+        """
+        if self.grid is None:
+            return None
+        view = self.grid.padded(self.padding if self.padding_flag else 0).view()
+        view.flags.writeable = False
+        return view
+
+    def _use_numpy(self):
+        if self.grid_backend == 'list':
+            return False
+        if load_numpy() is None:
+            if self.grid_backend == 'numpy':
+                raise ValueError('The numpy grid backend needs NumPy installed')
+            return False
+        return True
+
     def _pre_process_data(self):
-        encoder = ByteEncoder(self.data)
-        encoded_data = encoder.encode(qr_version=self.version)
+        segments = self._optimal_encoding()
+        streams = [segment.encode(qr_version=self.version) for segment in segments]
+        if self.structured_append is not None:
+            streams.insert(0, structured_append_header(*self.structured_append))
+        encoded_data = BitStream.merge_bitstreams(streams)
         capacity = get_codeword_capacity(self.version, self.ec_level) * 8
         if len(encoded_data) > capacity:
             raise ValueError(f'Data too long for version {self.version} with error correction level {self.ec_level}')
-        if capacity > len(encoded_data):
+        if capacity > len(encoded_data) and not self.auto_version:
             if float(len(encoded_data)) / capacity < 0.75:
-                print('Warning: Data is less than 75% the capacity of the QR code, consider using a smaller version')
+                warnings.warn('Data is less than 75% the capacity of the QR code, consider using a smaller version',
+                              stacklevel=3)
         encoded_data.pad_to_length(capacity)
         return encoded_data
     
+    def _select_version(self):
+        """Find the smallest version that fits the data, without encoding it"""
+        if isinstance(self.data, BitStream):
+            version = smallest_version(len(self.data), self.ec_level)
+        elif isinstance(self.data, list):
+            version = smallest_version(sum(len(stream) for stream in self.data), self.ec_level)
+        else:
+            # Segment sizes only change between the three count field classes
+            header_bits = STRUCTURED_APPEND_BITS if self.structured_append is not None else 0
+            version = None
+            for first, last in VERSION_CLASSES:
+                plan, num_bits = plan_segments(self.data, first)
+                version = smallest_version(num_bits + header_bits, self.ec_level, first, last)
+                if version is not None:
+                    # The plan holds for every version of the class, keep it for _pre_process_data
+                    self.segment_plan = plan
+                    break
+        if version is None:
+            raise ValueError(f'Data too long for any version with error correction level {self.ec_level}')
+        return version
+
+    def _encode_blocks(self, encoded_data=None):
+        # Blocks can be handed in already encoded, see generate_range
+        if self.blocks is None:
+            if encoded_data is None:
+                encoded_data = self._pre_process_data()
+            qr_ec = QRErrorCorrection(version=self.version, ec_level=self.ec_level, prefix_cache=self.prefix_cache)
+            self.blocks = qr_ec.encode_data(encoded_data.buffer)
+        return self.blocks
+
     def _prepare_data(self, encoded_data):
-        qr_ec = QRErrorCorrection(version=self.version, ec_level=self.ec_level)
+        self._encode_blocks(encoded_data)
         rs_config = QRErrorCorrection.get_raw_block_config(self.version, self.ec_level)
-        data_blocks, ec_blocks = qr_ec.encode_data(encoded_data.buffer)
+        data_blocks, ec_blocks = self.blocks
         data_final = interleave_blocks(data_blocks, rs_config)
         ec_final = interleave_blocks(ec_blocks, rs_config)
         data_stream = BitStream.from_int8_array(data_final)
@@ -52,16 +166,21 @@ class QRGenerator:
         if isinstance(self.data, str):
             if self.data == "test_colors":
                 return self._generate_color_data()
-            return self._prepare_data(self._pre_process_data())
+            return self._prepare_data(self._pre_process_data() if self.blocks is None else None)
+        elif isinstance(self.data, (bytes, bytearray, memoryview)):
+            return self._prepare_data(self._pre_process_data() if self.blocks is None else None)
         elif isinstance(self.data, list):
             return BitStream.merge_bitstreams(self.data).to_bool_array()
         elif isinstance(self.data, BitStream):
             return self.data.to_bool_array()
         else:
-            raise ValueError('Data must be a string or list of BitStreams')
+            raise ValueError('Data must be a string, bytes-like or list of BitStreams')
     
     def _optimal_encoding(self):
-        pass
+        """Split the data into the cheapest mix of numeric, alphanumeric, byte and kanji segments"""
+        if self.segment_plan is None:
+            self.segment_plan, _ = plan_segments(self.data, self.version)
+        return [encoder(segment) for encoder, segment in self.segment_plan]
     
     def show_mask(self):
         if self.data_mask is None:
@@ -104,6 +223,10 @@ class QRGenerator:
     def _add_dead_zones(self):
         if self.padding == 0 or self.padding_flag:
             return
+        if self.grid is not None:
+            # The array is never grown, the quiet zone is added on export and when rendering
+            self.padding_flag = True
+            return
         size_with_padding = self.size + (2 * self.padding)
         for column in self.modules:
             for _ in range(self.padding):
@@ -116,7 +239,38 @@ class QRGenerator:
     
     def add_required_elements(self):
         if self.modules is None:
-            self._create_module_grid()
+            # The function patterns only depend on the version, start from a copy of the shared template
+            template = TEMPLATES.get(self.version)
+            self.template = template
+            self.size = template.size
+            if self._use_numpy():
+                self._modules = None
+                self.grid = ArrayGrid.from_template(template)
+            else:
+                self.modules = template.new_modules()
+            self.data_mask = template.data_mask
+            return
+        self._place_function_patterns()
+        self._create_data_mask()                # Create data mask before data is placed
+
+    @classmethod
+    def build_template(cls, version: int) -> SymbolTemplate:
+        """Place every function pattern of a version on an empty grid, see TEMPLATES"""
+        qr = cls(version=version)
+        qr._create_module_grid()
+        qr._place_function_patterns()
+        qr._create_data_mask()
+        roles = bytearray(
+            ROLE_DATA if item is None else ROLE_FORMAT if item == 2 else ROLE_FUNCTION
+            for row in qr.modules for item in row
+        )
+        for i, j in qr._version_info_cells():
+            roles[i * qr.size + j] = ROLE_VERSION
+        data_order = array('H', (y * qr.size + x for x, y in qr._zigzag_cells() if qr.modules[y][x] is None))
+        format_order = tuple(array('H', (x * qr.size + y for x, y in cells)) for cells in qr._format_info_cells())
+        return SymbolTemplate(version, qr.size, qr.modules, qr.data_mask, bytes(roles), data_order, format_order)
+
+    def _place_function_patterns(self):
         self._place_all_separators()
         self._place_all_finders()
         self._place_alignment_patterns()
@@ -125,11 +279,12 @@ class QRGenerator:
         # self._place_version_info_color()
         self._place_version_info()
         self._place_error_correction_bits()
-        self._create_data_mask()                # Create data mask before data is placed
     
     def add_metadata(self):
         self._place_format_info()
-        self._place_version_info()
+        if self.grid is None:
+            # The NumPy grid already has the version info from the template
+            self._place_version_info()
     
     def _generate_color_data(self, size=4000):
         encoded = []
@@ -161,37 +316,85 @@ class QRGenerator:
         return indexed
     
     def fill_white(self):
+        if self.grid is not None:
+            # Unplaced data modules are already 0
+            self.grid.placed = True
+            return
         for i in range(self.size):
             for j in range(self.size):
                 if self.modules[i][j] is None:
                     self.modules[i][j] = False
     
     def apply_mask(self, pattern_number):
+        if self.grid is not None:
+            self.grid.apply_mask(pattern_number)
+            return
+        if self.template is not None:
+            # Only visit the modules the pattern flips, they're the same for every symbol of the version
+            for row, columns in zip(self.modules, self.template.mask_flips(pattern_number)):
+                for j in columns:
+                    row[j] = not row[j]
+            return
         apply_mask(self.modules, self.data_mask, pattern_number)
 
+    def mask_scorer(self) -> MaskScorer:
+        """MaskScorer for the grid as it is now, on whichever backend holds it"""
+        if self.grid is not None:
+            return ArrayScorer(self.grid)
+        # Row and column bitsets when the grid only holds 0, 1 and 2
+        bitsets = BitsetGrid.from_modules(self.modules)
+        if bitsets is not None:
+            if self.template is not None:
+                return BitsetScorer(bitsets, self.template.mask_words)
+            return BitsetScorer(bitsets, partial(mask_words, self.data_mask))
+        return ListScorer(self.modules, self.data_mask)
+
     def _evaluate_mask(self, mask_number):
-        temp_modules = [row[:] for row in self.modules] # Copy the modules
-        apply_mask(temp_modules, self.data_mask, mask_number)
-        eval_score = evaluate_mask(temp_modules)
-        return eval_score
-    
-    def _find_best_mask(self):
-        best_score = None
-        best_mask = None
-        for i in range(8):
-            score = self._evaluate_mask(i)
-            if best_score is None or score < best_score:
-                best_score = score
-                best_mask = i
-        return best_mask
-    
-    def apply_best_mask(self):
-        best_mask = self._find_best_mask()
-        apply_mask(self.modules, self.data_mask, best_mask)
+        return self.mask_scorer().penalty(mask_number)
+    
+    def _find_best_mask(self, scorer=None):
+        self.mask_choice = self.mask_strategy.select(scorer if scorer is not None else self.mask_scorer(), self.version)
+        return self.mask_choice.mask
+    
+    def apply_best_mask(self, scorer: MaskScorer = None):
+        """
+        Args:
+            scorer: MaskScorer that already knows this grid, e.g. an IncrementalScorer
+                    carried over from the previous symbol. Made from the grid when not given
+        """
+        best_mask = self._find_best_mask(scorer)
+        self.apply_mask(best_mask)
         self.mask_pattern = best_mask
     
     def place_data(self):
+        if self.template is not None and self._has_codewords():
+            # Interleaving and the zigzag are precomputed for the version and EC level,
+            # every codeword bit goes straight to its module
+            data_blocks, ec_blocks = self._encode_blocks()
+            if self.grid is not None:
+                self.grid.place(PLACEMENTS.get(self.version, self.ec_level.upper()), data_blocks, ec_blocks)
+                return
+            self.modules = PLACEMENTS.get(self.version, self.ec_level.upper()).place(self.modules, data_blocks, ec_blocks)
+            return
         encoded_data = self._encode_data()
+        if self.grid is not None:
+            self.grid.place_stream(self.template.data_order, encoded_data)
+            return
+        # Walk the bits with an iterator so lists and arrays are consumed the same way
+        bits = iter(encoded_data)
+        for (x,y) in self._zigzag_cells():
+            if self.modules[y][x] is None:
+                # Just pad with False if we run out of data
+                self.modules[y][x] = next(bits, 0)
+
+    def _has_codewords(self):
+        # Strings and bytes are encoded into codewords, lists and BitStreams are placed as raw bits
+        if isinstance(self.data, str):
+            return self.data != "test_colors"
+        return isinstance(self.data, (bytes, bytearray, memoryview))
+
+    def _zigzag_cells(self):
+        """(x, y) of every module in the order data is placed, function patterns included"""
         indexed = self._get_indexed_array()
         # Throw out column 6
         indexed = indexed[:6] + indexed[7:]
@@ -214,13 +417,7 @@ class QRGenerator:
             # Every second pair of rows, reverse the flat order as we go downwards
             if counter % 2 == 0:
                 flat = flat[::-1]
-            for (x,y) in flat:
-                if self.modules[y][x] is None:
-                    try:
-                        # Just pad with False if we run out of data
-                        self.modules[y][x] = encoded_data.pop(0)
-                    except IndexError:
-                        self.modules[y][x] = 0
+            yield from flat
             counter += 1
     
     def _place_black_module(self):
@@ -302,68 +499,68 @@ class QRGenerator:
             for xmod in range(3):
                 self.modules[y][self.size-11+xmod] = 3
     
+    def _version_info_cells(self):
+        """(row, column) of both version info copies, each in bit order. Empty below version 7"""
+        if self.version < 7:
+            return []
+        # Bottom Left
+        cells = [(self.size-11+ymod, x) for x in range(6) for ymod in range(3)]
+        # Top Right
+        cells += [(y, self.size-11+xmod) for y in range(6) for xmod in range(3)]
+        return cells
+
     def _place_version_info(self):
         if self.version < 7:
             return
         version_bits = QRVersionInfo.get_version_bits(self.version)
-
-        # Bottom Left
-        i = 0
-        for x in range(6):
-            for ymod in range(3):
-                self.modules[self.size-11+ymod][x] = version_bits[i]
-                i += 1
-        
-        # Top Right
-        i = 0
-        for y in range(6):
-            for xmod in range(3):
-                self.modules[y][self.size-11+xmod] = version_bits[i]
-                i += 1
+        for n, (i, j) in enumerate(self._version_info_cells()):
+            self.modules[i][j] = version_bits[n % 18]
 
     
-    def _place_format_info(self):
-        if self.mask_pattern is None:
-            raise ValueError('Mask pattern must be set before placing format info')
-        format_bits = QRFormatInfo.get_format_bits(self.ec_level, self.mask_pattern)
-
+    def _format_info_cells(self):
+        """(row, column) of both format info copies, each in bit order. The walk skips the timing modules"""
         # Top left
         x = 8
         y = 0
-        i = 0
+        top_left = []
         while y < 8:
-            current = self.modules[x][y]
-            if current != 1:
-                self.modules[x][y] = format_bits[i]
-                i += 1
+            if self.modules[x][y] != 1:
+                top_left.append((x, y))
             y += 1
         while x > -1:
-            current = self.modules[x][y]
-            if current != 1:
-                self.modules[x][y] = format_bits[i]
-                i += 1
+            if self.modules[x][y] != 1:
+                top_left.append((x, y))
             x -= 1
-        
+
         # Bottom left
         x = self.size - 1
         y = 8
-        i = 0
+        other = []
         while x > self.size - 8:
-            current = self.modules[x][y]
-            if current != 1:
-                self.modules[x][y] = format_bits[i]
-                i += 1
+            if self.modules[x][y] != 1:
+                other.append((x, y))
             x -= 1
-        
+
         # Top right
         x = 8
         y = self.size - 8
         while y < self.size:
-            current = self.modules[x][y]
-            if current != 1:
-                self.modules[x][y] = format_bits[i]
-                i += 1
+            if self.modules[x][y] != 1:
+                other.append((x, y))
             y += 1
+        return top_left, other
+
+    def _place_format_info(self):
+        if self.mask_pattern is None:
+            raise ValueError('Mask pattern must be set before placing format info')
+        format_bits = QRFormatInfo.get_format_bits(self.ec_level, self.mask_pattern)
+        if self.grid is not None:
+            for positions in self.template.format_order:
+                self.grid.place_bits(positions, format_bits[:len(positions)])
+            return
+        for cells in self._format_info_cells():
+            for i, (x, y) in enumerate(cells):
+                self.modules[x][y] = format_bits[i]
 
     def _place_error_correction_bits(self):
         # It's handy if we do this in the correct order already
@@ -400,10 +597,14 @@ class QRGenerator:
             y += 1
         
     def create_image(self):
+        if self.grid is not None:
+            return GridImage.from_array(self.grid.padded(self.padding if self.padding_flag else 0), self.module_size)
         return GridImage(self.modules, self.module_size)
  
     @staticmethod
     def _size_from_version(version):
         return 17 + (4 * version)
 
-
+# Shared by every QRGenerator, see add_required_elements
+TEMPLATES = TemplateCache(QRGenerator.build_template)
+PLACEMENTS = PlacementCache(TEMPLATES)
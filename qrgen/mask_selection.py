@@ -0,0 +1,166 @@
+## Mask selection strategies. Scoring all 8 masks is the slowest part of building a big symbol,
+## so callers with a latency budget can trade a slightly worse penalty for a faster pick.
+import time
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .mask_patterns import apply_mask, condition_1, condition_2, condition_3, condition_4
+
+NUM_MASKS = 8
+
+class MaskChoice(NamedTuple):
+    mask: int
+    strategy: str
+    # Full penalty of every mask that was scored to the end, None when it was skipped or abandoned
+    scores: List[Optional[int]]
+    # Seconds spent choosing
+    elapsed: float
+
+class MaskScorer:
+    """
+    Scores the mask candidates of one symbol. Every grid backend has its own,
+    see QRGenerator.mask_scorer
+    """
+    def conditions(self, pattern_number: int) -> Iterator[int]:
+        """The penalty of each condition with the mask applied, cheapest first"""
+        raise NotImplementedError
+
+    def penalty(self, pattern_number: int) -> int:
+        return sum(self.conditions(pattern_number))
+
+    def penalties(self) -> List[int]:
+        return [self.penalty(k) for k in range(NUM_MASKS)]
+
+class ArrayScorer(MaskScorer):
+    def __init__(self, grid):
+        self.grid = grid
+
+    def conditions(self, pattern_number: int) -> Iterator[int]:
+        return self.grid.conditions(pattern_number)
+
+    def penalties(self) -> List[int]:
+        # All 8 candidates as one stack
+        return self.grid.mask_penalties()
+
+class BitsetScorer(MaskScorer):
+    def __init__(self, grid, mask_words: Callable):
+        self.grid = grid
+        self.mask_words = mask_words
+
+    def conditions(self, pattern_number: int) -> Iterator[int]:
+        return self.grid.masked(*self.mask_words(pattern_number)).conditions()
+
+class ListScorer(MaskScorer):
+    """Masked copies scored with mask_patterns, for grids holding values the other backends can't"""
+    def __init__(self, modules, data_mask):
+        self.modules = modules
+        self.data_mask = data_mask
+
+    def conditions(self, pattern_number: int) -> Iterator[int]:
+        modules = [row[:] for row in self.modules]
+        apply_mask(modules, self.data_mask, pattern_number)
+        yield condition_4(modules)
+        yield condition_2(modules)
+        yield condition_1(modules)
+        yield condition_3(modules)
+
+def _lowest(scores: List[int]) -> int:
+    # Ties go to the lowest mask number, like the search always did
+    return min(range(len(scores)), key=scores.__getitem__)
+
+class MaskStrategy:
+    """Picks the mask of a symbol from a MaskScorer"""
+    name = None
+
+    def select(self, scorer: MaskScorer, version: int) -> MaskChoice:
+        start = time.perf_counter()
+        mask, scores = self._select(scorer, version)
+        return MaskChoice(mask, self.name, scores, time.perf_counter() - start)
+
+    def _select(self, scorer: MaskScorer, version: int):
+        """Returns (mask, scores), see MaskChoice"""
+        raise NotImplementedError
+
+class ExhaustiveStrategy(MaskStrategy):
+    """Full penalty of all 8 masks, the lowest one wins"""
+    name = 'exhaustive'
+
+    def _select(self, scorer, version):
+        scores = scorer.penalties()
+        return _lowest(scores), scores
+
+class BranchAndBoundStrategy(MaskStrategy):
+    """
+    Adds up the conditions cheapest first and drops a mask as soon as it can't beat the best one so far.
+    Penalties are never negative, so it always picks the same mask as ExhaustiveStrategy.
+
+    Args:
+        order: Masks to try first, e.g. the ones that usually win for your data. A good
+               early pick lets more of the other masks be dropped
+    """
+    name = 'branch-and-bound'
+
+    def __init__(self, order: Iterable[int] = range(NUM_MASKS)):
+        self.order = list(order)
+
+    def _select(self, scorer, version, deadline: Optional[float] = None):
+        scores = [None] * NUM_MASKS
+        best = None     # (penalty, mask), so ties go to the lowest mask number in any order
+        for k in self.order:
+            if deadline is not None and best is not None and time.perf_counter() >= deadline:
+                break
+            total = 0
+            for penalty in scorer.conditions(k):
+                total += penalty
+                if best is not None and (total, k) > best:
+                    break
+            else:
+                scores[k] = total
+                best = (total, k)
+        return best[1], scores
+
+class DeadlineStrategy(BranchAndBoundStrategy):
+    """
+    Branch and bound that doesn't start another mask once the time budget is used up,
+    and returns the best mask found so far. At least one mask is always scored.
+
+    Args:
+        budget: Seconds to spend on one symbol
+        order: Masks to try first, see BranchAndBoundStrategy
+    """
+    name = 'deadline'
+
+    def __init__(self, budget: float, order: Iterable[int] = range(NUM_MASKS)):
+        super().__init__(order)
+        self.budget = budget
+
+    def _select(self, scorer, version, deadline: Optional[float] = None):
+        return super()._select(scorer, version, time.perf_counter() + self.budget)
+
+class ReuseStrategy(MaskStrategy):
+    """
+    For a batch of symbols of the same version, e.g. serial numbers: keep the mask the last
+    full search picked and only score that one, until its penalty gets more than `tolerance`
+    above what it was when it was picked. Then search again with `strategy`.
+    """
+    name = 'reuse'
+
+    def __init__(self, tolerance: int = 0, strategy: Optional[MaskStrategy] = None):
+        self.tolerance = tolerance
+        self.strategy = strategy if strategy is not None else BranchAndBoundStrategy()
+        # version -> (mask, penalty when it was picked)
+        self.previous: Dict[int, tuple] = {}
+
+    def _select(self, scorer, version):
+        previous = self.previous.get(version)
+        if previous is not None:
+            mask, reference = previous
+            score = scorer.penalty(mask)
+            if score <= reference + self.tolerance:
+                scores = [None] * NUM_MASKS
+                scores[mask] = score
+                return mask, scores
+        mask, scores = self.strategy._select(scorer, version)
+        self.previous[version] = (mask, scores[mask])
+        return mask, scores
+
+DEFAULT_STRATEGY = ExhaustiveStrategy()
@@ -0,0 +1,140 @@
+## Precomputed data placement. Interleaving and the zigzag walk only depend on the version and
+## EC level, so they're folded into one table that sends every codeword bit straight to its module.
+from array import array
+from dataclasses import dataclass, field
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, List, Tuple
+
+from .reedsolomon import QRErrorCorrection
+from .utils import interleave_blocks, load_numpy
+
+# '0'/'1' characters -> 0/1 byte values
+_BIT_VALUES = bytes.maketrans(b'01', b'\x00\x01')
+
+def unpack_bits(data: bytes) -> bytes:
+    """One 0/1 byte per bit of data, MSB first"""
+    if not data:
+        return b''
+    return format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b').encode('ascii').translate(_BIT_VALUES)
+
+def _codewords(data_blocks, ec_blocks) -> bytes:
+    """Every word block after block, all data blocks first"""
+    return bytes(chain(chain.from_iterable(data_blocks), chain.from_iterable(ec_blocks)))
+
+def _interleaved_positions(blocks: List[List[int]], block_structure) -> List[int]:
+    """Position in the interleaved stream of every word, block after block"""
+    order = interleave_blocks(blocks, block_structure)
+    positions = [0] * len(order)
+    for position, word in enumerate(order):
+        positions[word] = position
+    return positions
+
+@dataclass
+class PlacementTable:
+    version: int
+    ec_level: str
+    size: int
+    # Row-major module index of every codeword bit. Bits are numbered block after block,
+    # all data blocks first and then all EC blocks, each word MSB first
+    positions: array
+    # Data modules after the last codeword bit, they hold 0 before masking
+    remainder: array
+    # One itemgetter per row that builds the row from the current modules followed by the bits
+    row_getters: List[itemgetter] = field(default_factory=list, repr=False)
+    numpy_positions: object = field(default=None, repr=False)
+
+    @classmethod
+    def build(cls, template, ec_level: str) -> 'PlacementTable':
+        """
+        Args:
+            template: SymbolTemplate of the version, its data_order is the zigzag walk
+            ec_level: Error correction level
+        """
+        blocks = QRErrorCorrection.get_block_config(template.version, ec_level)
+        rs_config = QRErrorCorrection.get_raw_block_config(template.version, ec_level)
+        # Number every word block after block, then see where interleaving puts it
+        word = iter(range(sum(block.total_words for block in blocks)))
+        data_blocks = [[next(word) for _ in range(block.data_words)] for block in blocks]
+        ec_blocks = [[next(word) for _ in range(block.total_words - block.data_words)] for block in blocks]
+        num_data_words = sum(block.data_words for block in blocks)
+        data_positions = _interleaved_positions(data_blocks, rs_config)
+        ec_positions = _interleaved_positions(
+            [[i - num_data_words for i in block] for block in ec_blocks], rs_config)
+        word_positions = data_positions + [num_data_words + p for p in ec_positions]
+
+        order = template.data_order
+        positions = array('H', (order[p * 8 + bit] for p in word_positions for bit in range(8)))
+        remainder = order[len(positions):]
+
+        # Where every module of a placed grid comes from: itself, a codeword bit or a 0 remainder bit
+        cells = template.size * template.size
+        sources = list(range(cells))
+        for bit, position in enumerate(positions):
+            sources[position] = cells + bit
+        for position in remainder:
+            sources[position] = cells + len(positions)
+        size = template.size
+        row_getters = [itemgetter(*sources[row * size:(row + 1) * size]) for row in range(size)]
+        return cls(template.version, ec_level, size, positions, remainder, row_getters)
+
+    def codeword_bits(self, data_blocks, ec_blocks) -> bytes:
+        """0/1 byte per codeword bit, in the same order as positions"""
+        return unpack_bits(_codewords(data_blocks, ec_blocks))
+
+    def changed_modules(self, old_blocks, new_blocks) -> List[Tuple[int, int, int]]:
+        """
+        The modules that differ between two symbols of this version and EC level, before masking.
+
+        Args:
+            old_blocks: (data blocks, EC blocks) of the previous symbol
+            new_blocks: (data blocks, EC blocks) of the new one
+
+        Returns:
+            List of (row, column, new bit)
+        """
+        changes = []
+        old, new = _codewords(*old_blocks), _codewords(*new_blocks)
+        for word, (a, b) in enumerate(zip(old, new)):
+            if a != b:
+                diff = a ^ b
+                for bit in range(8):
+                    if diff & (0x80 >> bit):
+                        row, column = divmod(self.positions[word * 8 + bit], self.size)
+                        changes.append((row, column, (b >> (7 - bit)) & 1))
+        return changes
+
+    def place(self, modules: List[list], data_blocks, ec_blocks) -> List[list]:
+        """
+        New rows with every codeword bit in its module, one gather per row.
+        Non data modules are taken from modules as they are.
+        """
+        values = list(chain.from_iterable(modules))
+        values += self.codeword_bits(data_blocks, ec_blocks)
+        values.append(0)
+        return [list(getter(values)) for getter in self.row_getters]
+
+    def as_numpy(self):
+        """(positions, remainder) as NumPy index arrays"""
+        if self.numpy_positions is None:
+            np = load_numpy()
+            self.numpy_positions = (np.frombuffer(self.positions, dtype=np.uint16).astype(np.intp),
+                                    np.frombuffer(self.remainder, dtype=np.uint16).astype(np.intp))
+        return self.numpy_positions
+
+class PlacementCache:
+    """PlacementTables by (version, EC level), built on first use"""
+    def __init__(self, templates):
+        self.templates = templates
+        self.tables: Dict[Tuple[int, str], PlacementTable] = {}
+
+    def get(self, version: int, ec_level: str) -> PlacementTable:
+        key = (version, ec_level)
+        table = self.tables.get(key)
+        if table is None:
+            table = PlacementTable.build(self.templates.get(version), ec_level)
+            self.tables[key] = table
+        return table
+
+    def clear(self):
+        self.tables.clear()
@@ -3,17 +3,30 @@ Trying to make a program that'll compute the generator polynomial for a given
 set of Reed-Solomon error correction blocks/codewords.
 """
 
+try:
+    from . import _tables
+except ImportError:     # Tables not generated yet, everything gets computed instead
+    _tables = None
+
+STANDARD_FIELD = (0x11D, 256)
+
 # So how do we compute one polynomial from another?
 
 # Starting polynomial has exponents
-from functools import lru_cache
 
 class GaloisField:
     def __init__(self, prime_modulus=0x11D, field_size=256):
         """Initialize Galois Field GF(2^8)"""
         self.prime_modulus = prime_modulus
         self.field_size = field_size
-        self.exp = [0] * field_size  # exp table
+
+        if _tables is not None and (prime_modulus, field_size) == STANDARD_FIELD:
+            # Frozen tables from polynomial_bootstrap.py
+            self.exp = list(_tables.EXP)
+            self.log = list(_tables.LOG)
+            return
+
+        self.exp = [0] * (2 * field_size)  # exp table, doubled so log sums never need a modulo
         self.log = [0] * field_size  # log table
         
         # Generate exp and log tables
@@ -25,6 +38,8 @@ class GaloisField:
             x = self._multiply_no_lookup(x, 2)
             if x >= field_size:
                 x ^= prime_modulus
+        for i in range(field_size, 2 * field_size):
+            self.exp[i] = self.exp[i - (field_size - 1)]
     
     def _multiply_no_lookup(self, x, y):
         """Multiply two numbers in the field without using lookup tables"""
@@ -42,11 +57,33 @@ class GaloisField:
         """Multiply two numbers in the field using lookup tables"""
         if x == 0 or y == 0:
             return 0
-        return self.exp[(self.log[x] + self.log[y]) % (self.field_size - 1)]
+        return self.exp[self.log[x] + self.log[y]]
+
+    def divide(self, x, y):
+        """Divide two numbers in the field using lookup tables"""
+        if y == 0:
+            raise ZeroDivisionError('Division by zero in GF(256)')
+        if x == 0:
+            return 0
+        return self.exp[self.log[x] + (self.field_size - 1) - self.log[y]]
+
+    def inverse(self, x):
+        return self.divide(1, x)
+
+    def power(self, x, exponent):
+        """x to any integer power, negative exponents included"""
+        if x == 0:
+            return 0
+        return self.exp[(self.log[x] * exponent) % (self.field_size - 1)]
+
+# One field for the whole process, the tables never change
+GF256 = GaloisField()
 
 class GeneratorPolynomialCalculator:
-    def __init__(self):
-        self.gf = GaloisField()
+    def __init__(self, gf=None):
+        self.gf = gf if gf is not None else GF256
+        self.polynomials = {}
+        self.log_polynomials = {}
     
     def multiply_polynomials(self, poly1, poly2):
         """Multiply two polynomials in the Galois Field"""
@@ -58,21 +95,34 @@ class GeneratorPolynomialCalculator:
                 result[idx] ^= term
         return result
     
-    @lru_cache(maxsize=128)
     def generate_generator_polynomial(self, num_error_bytes):
         """
-        Recursively generate the generator polynomial for given number of error correction bytes
-        Using @lru_cache to store and reuse results
+        Generate the generator polynomial for given number of error correction bytes
+        g_n(x) = g_{n-1}(x) * (x + α^{n-1}), every size built on the way is kept
         """
+        poly = self.polynomials.get(num_error_bytes)
+        if poly is not None:
+            return poly
         if num_error_bytes == 1:
             # Base case: g(x) = (x + α^0)
-            return [1, self.gf.exp[0]]
-        
-        # Recursive case: g(x) = g_{n-1}(x) * (x + α^{n-1})
-        prev_poly = self.generate_generator_polynomial(num_error_bytes - 1)
-        multiplicand = [1, self.gf.exp[num_error_bytes - 1]]  # (x + α^{n-1})
-        
-        return self.multiply_polynomials(prev_poly, multiplicand)
+            poly = [1, self.gf.exp[0]]
+        else:
+            prev_poly = self.generate_generator_polynomial(num_error_bytes - 1)
+            multiplicand = [1, self.gf.exp[num_error_bytes - 1]]  # (x + α^{n-1})
+            poly = self.multiply_polynomials(prev_poly, multiplicand)
+        self.polynomials[num_error_bytes] = poly
+        return poly
+
+    def generator_log(self, num_error_bytes):
+        """Generator polynomial with every coefficient in log form, computed once per size"""
+        poly = self.log_polynomials.get(num_error_bytes)
+        if poly is None:
+            if self.gf is GF256 and _tables is not None and num_error_bytes in _tables.GENERATOR_LOGS:
+                poly = list(_tables.GENERATOR_LOGS[num_error_bytes])
+            else:
+                poly = [self.gf.log[c] for c in self.generate_generator_polynomial(num_error_bytes)]
+            self.log_polynomials[num_error_bytes] = poly
+        return poly
 
     def generate_all_polynomials(self, max_bytes=68):
         """Generate all generator polynomials needed for QR codes"""
@@ -1,7 +1,12 @@
 # This is gonna be the toughest bit of this project I think
-from typing import List, Tuple
+from typing import List, Optional, Tuple, NamedTuple
 from dataclasses import dataclass
-from .polynomial_gen import GeneratorPolynomialCalculator
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import reduce
+from operator import xor
+from .polynomial_gen import GeneratorPolynomialCalculator, _tables
+from .utils import load_numpy, numpy_available
 
 """
 Blocks defined here are as follows:
@@ -235,6 +240,8 @@ def get_rs_block_table(version, ec_mode):
     return RS_BLOCK_TABLE[(version - 1) * 4 + EC_INDEX[ec_mode]]
 
 def get_codeword_capacity(version, ec_mode):
+    if _tables is not None and 1 <= version <= 40:
+        return _tables.DATA_CAPACITY[ec_mode][version - 1]
     config = get_rs_block_table(version, ec_mode)
     block_config = [config[i:i + 3] for i in range(0, len(config), 3)]
     return sum([
@@ -242,6 +249,26 @@ def get_codeword_capacity(version, ec_mode):
         for count, _, data in block_config
     ])
 
+# Version ranges sharing the same character count field sizes
+VERSION_CLASSES = ((1, 9), (10, 26), (27, 40))
+
+# Data capacity in bits for every version, per EC level. Index 0 is version 1.
+CAPACITY_INDEX = {
+    ec_mode: tuple(get_codeword_capacity(version, ec_mode) * 8 for version in range(1, 41))
+    for ec_mode in EC_INDEX
+}
+
+def smallest_version(num_bits, ec_mode, min_version=1, max_version=40):
+    """
+    Smallest version in [min_version, max_version] whose data capacity fits num_bits,
+    or None when none of them do. Capacities grow with the version so this is a bisection.
+    """
+    capacities = CAPACITY_INDEX[ec_mode.upper()]
+    index = bisect_left(capacities, num_bits, min_version - 1, max_version)
+    if index >= max_version:
+        return None
+    return index + 1
+
 class RSBlock:
     total_count: int
     data_count: int
@@ -264,10 +291,77 @@ class RSBlock:
         """Number of error correction words"""
         return self.total_words - self.data_words
 
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    # None when the cache has no bound, like functools.lru_cache
+    maxsize: Optional[int]
+    currsize: int
+
+class PrefixCache:
+    """
+    Bounded LRU cache of Reed-Solomon register states after a prefix of a block.
+    States are stored every `interval` data words, keyed by the block and the prefix itself,
+    so payloads sharing a long prefix (same URL, different token) only divide their suffix.
+    """
+    def __init__(self, maxsize: int = 4096, interval: int = 16):
+        self.maxsize = maxsize
+        self.interval = interval
+        self.states = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        state = self.states.get(key)
+        if state is not None:
+            self.states.move_to_end(key)
+        return state
+
+    def put(self, key, state):
+        self.states[key] = state
+        self.states.move_to_end(key)
+        if len(self.states) > self.maxsize:
+            self.states.popitem(last=False)
+
+    def record(self, hit: bool):
+        # One hit or miss per block, not per probed checkpoint
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.states))
+
+    def clear(self):
+        self.states.clear()
+        self.hits = 0
+        self.misses = 0
+
 class ReedSolomonEncoder:
     def __init__(self, generator_calculator):
         self.generator_calc = generator_calculator
         self.gf = generator_calculator.gf
+        self.remainder_tables = {}
+        self.remainder_arrays = {}
+        self.position_remainders = {}
+
+    def remainder_table(self, ec_words: int) -> List[int]:
+        """
+        CRC style lookup table for one generator polynomial.
+        Entry f is f * g(x) without the leading term, packed into an ec_words byte integer,
+        which is what gets XORed into the remainder when f comes out of the top of the register.
+        """
+        table = self.remainder_tables.get(ec_words)
+        if table is None:
+            generator = self.generator_calc.generator_log(ec_words)[1:]
+            exp, log = self.gf.exp, self.gf.log
+            table = [0] * 256
+            for factor in range(1, 256):
+                factor_log = log[factor]
+                table[factor] = int.from_bytes(bytes([exp[factor_log + g] for g in generator]), 'big')
+            self.remainder_tables[ec_words] = table
+        return table
         
     def encode_block(self, data: List[int], ec_words: int) -> List[int]:
         """
@@ -280,22 +374,317 @@ class ReedSolomonEncoder:
         Returns:
             List of error correction words
         """
-        generator = self.generator_calc.generate_generator_polynomial(ec_words)
-        
-        # Create the message polynomial
-        message = list(data) + [0] * ec_words
-        
-        # Perform polynomial division
-        for i in range(len(data)):
-            if message[i] == 0:
+        remainder = self.advance(0, data, ec_words)
+        return list(remainder.to_bytes(ec_words, 'big'))
+
+    def advance(self, remainder: int, data: List[int], ec_words: int) -> int:
+        """
+        Feed data words into the remainder register and return the new register.
+        The register is one integer, the leading word sits in the top byte.
+        """
+        table = self.remainder_table(ec_words)
+        shift = 8 * (ec_words - 1)
+        mask = (1 << (8 * ec_words)) - 1
+        for word in data:
+            remainder = ((remainder << 8) & mask) ^ table[(remainder >> shift) ^ word]
+        return remainder
+
+    def encode_block_cached(self, data: List[int], ec_words: int, cache: 'PrefixCache', key: tuple) -> List[int]:
+        """
+        Same as encode_block, but resumes from the longest cached prefix of the block.
+        Every call caches one more checkpoint past the longest hit, so a prefix that keeps
+        coming back is cached deeper each time while one-off suffixes barely touch the cache.
+
+        Args:
+            cache: PrefixCache to look up and store register states in
+            key: Identifies the block, e.g. (version, ec_level, block index)
+        """
+        interval = cache.interval
+        start = 0
+        remainder = 0
+        for end in range(interval, len(data) + 1, interval):
+            state = cache.get(key + (bytes(data[:end]),))
+            if state is None:
+                break
+            start, remainder = end, state
+        cache.record(start > 0)
+        end = start + interval
+        if end <= len(data):
+            remainder = self.advance(remainder, data[start:end], ec_words)
+            cache.put(key + (bytes(data[:end]),), remainder)
+            start = end
+        remainder = self.advance(remainder, data[start:], ec_words)
+        return list(remainder.to_bytes(ec_words, 'big'))
+
+    def position_remainder(self, ec_words: int, distance: int) -> bytes:
+        """
+        Error correction words of a block holding a single 1, distance words before the end
+        of the data. Built by running zero words through the register, cached per size.
+        """
+        remainders = self.position_remainders.setdefault(ec_words, [])
+        if distance >= len(remainders):
+            table = self.remainder_table(ec_words)
+            shift = 8 * (ec_words - 1)
+            mask = (1 << (8 * ec_words)) - 1
+            remainder = int.from_bytes(remainders[-1], 'big') if remainders else None
+            while len(remainders) <= distance:
+                if remainder is None:
+                    remainder = table[1]
+                else:
+                    remainder = ((remainder << 8) & mask) ^ table[remainder >> shift]
+                remainders.append(remainder.to_bytes(ec_words, 'big'))
+        return remainders[distance]
+
+    def update_block(self, ec_block: List[int], data_words: int, changes) -> List[int]:
+        """
+        Error correction words after changing some data words, without re-encoding the block.
+        Reed-Solomon is linear, so each change XORs in delta times the remainder for its position.
+
+        Args:
+            ec_block: Current error correction words of the block
+            data_words: Number of data words in the block
+            changes: Mapping of position in the block -> XOR of old and new word
+
+        Returns:
+            List of updated error correction words
+        """
+        ec_words = len(ec_block)
+        exp, log = self.gf.exp, self.gf.log
+        updated = list(ec_block)
+        for position, delta in changes.items():
+            if not delta:
                 continue
-                
-            factor = self.gf.log[message[i]]
-            
-            for j in range(len(generator)):
-                message[i + j] ^= self.gf.exp[(self.gf.log[generator[j]] + factor) % 255]
-        
-        return message[-ec_words:]
+            delta_log = log[delta]
+            unit = self.position_remainder(ec_words, data_words - 1 - position)
+            for j, word in enumerate(unit):
+                if word:
+                    updated[j] ^= exp[delta_log + log[word]]
+        return updated
+
+    def remainder_array(self, ec_words: int):
+        """The remainder table as a (256, ec_words) uint8 array, one row per factor"""
+        array = self.remainder_arrays.get(ec_words)
+        if array is None:
+            np = load_numpy()
+            table = self.remainder_table(ec_words)
+            packed = b''.join(entry.to_bytes(ec_words, 'big') for entry in table)
+            array = np.frombuffer(packed, dtype=np.uint8).reshape(256, ec_words)
+            self.remainder_arrays[ec_words] = array
+        return array
+
+    def encode_blocks(self, blocks, ec_words: int):
+        """
+        Encode many blocks of the same length at once, needs NumPy.
+        Each step divides every block by the generator together, gathering one table row per block.
+
+        Args:
+            blocks: (number of blocks, data words) uint8 array
+            ec_words: Number of error correction words to generate
+
+        Returns:
+            (number of blocks, ec_words) uint8 array of error correction words
+        """
+        np = load_numpy()
+        if np is None:
+            raise ImportError('encode_blocks requires numpy to be installed')
+        table = self.remainder_array(ec_words)
+        count, data_words = blocks.shape
+        message = np.zeros((count, data_words + ec_words), dtype=np.uint8)
+        message[:, :data_words] = blocks
+        for i in range(data_words):
+            message[:, i + 1:i + 1 + ec_words] ^= table[message[:, i]]
+        return message[:, data_words:]
+
+# Below this many blocks the per-step NumPy overhead outweighs the Python loop
+NUMPY_MIN_BLOCKS = 50
+
+# Shared by every QRErrorCorrection so the generator polynomials and tables are only built once
+RS_ENCODER = ReedSolomonEncoder(GeneratorPolynomialCalculator())
+
+class ReedSolomonError(ValueError):
+    """Raised when a block has more errors than its error correction words can fix"""
+
+class ReedSolomonDecoder:
+    """
+    Checks and corrects blocks made by ReedSolomonEncoder, using the same field tables.
+    A codeword is the data words followed by the error correction words, first word is
+    the highest power of x, and the generator roots are α^0 ... α^(ec_words - 1).
+    """
+    def __init__(self, generator_calculator):
+        self.generator_calc = generator_calculator
+        self.gf = generator_calculator.gf
+
+    def syndromes(self, codeword: List[int], ec_words: int) -> List[int]:
+        """The codeword evaluated at every generator root, all zero for a valid codeword"""
+        return [self._syndrome(codeword, i) for i in range(ec_words)]
+
+    def _syndrome(self, codeword, root_log):
+        # Horner's rule with the root in log form, exp is doubled so no modulo is needed
+        exp, log = self.gf.exp, self.gf.log
+        value = 0
+        for word in codeword:
+            value = (exp[log[value] + root_log] if value else 0) ^ word
+        return value
+
+    def verify_block(self, codeword: List[int], ec_words: int) -> bool:
+        """Whether the codeword is valid, stops at the first non-zero syndrome"""
+        # The first syndrome (root α^0 = 1) is just the XOR of every word
+        if reduce(xor, codeword, 0):
+            return False
+        for i in range(1, ec_words):
+            if self._syndrome(codeword, i):
+                return False
+        return True
+
+    def syndromes_blocks(self, codewords, ec_words: int):
+        """
+        Syndromes of many codewords of the same length at once, needs NumPy.
+
+        Args:
+            codewords: (number of blocks, words) uint8 array
+
+        Returns:
+            (number of blocks, ec_words) uint8 array
+        """
+        np = load_numpy()
+        if np is None:
+            raise ImportError('syndromes_blocks requires numpy to be installed')
+        # Horner's rule for every block and every root at once, one step per word.
+        # log(0) points past the end of the exp table into zeros, so zero needs no special case.
+        exp = np.zeros(1024, dtype=np.uint8)
+        exp[:len(self.gf.exp)] = self.gf.exp
+        log = np.array(self.gf.log, dtype=np.int16)
+        log[0] = 768
+        roots = np.arange(ec_words, dtype=np.int16)
+        codewords = np.asarray(codewords, dtype=np.uint8)
+        result = np.zeros((codewords.shape[0], ec_words), dtype=np.uint8)
+        for column in codewords.T:
+            result = exp[log[result] + roots]
+            result ^= column[:, None]
+        return result
+
+    def verify_blocks(self, codewords, ec_words: int):
+        """Boolean array, True for every valid codeword. Needs NumPy."""
+        return ~self.syndromes_blocks(codewords, ec_words).any(axis=1)
+
+    def decode_block(self, codeword: List[int], ec_words: int, erasures: List[int] = ()) -> List[int]:
+        """
+        Correct a codeword. Each unknown error costs two error correction words,
+        each erasure (an error at a known position) only one.
+
+        Args:
+            codeword: Data words followed by error correction words
+            ec_words: Number of error correction words
+            erasures: Indices in the codeword known to be wrong
+
+        Returns:
+            The corrected codeword
+
+        Raises:
+            ReedSolomonError: When there are too many errors to correct
+        """
+        message = list(codeword)
+        erasures = list(erasures)
+        if len(erasures) > ec_words:
+            raise ReedSolomonError('Too many erasures to correct')
+        for position in erasures:
+            message[position] = 0
+        syndromes = self.syndromes(message, ec_words)
+        if not any(syndromes):
+            return message
+        forney = self._forney_syndromes(syndromes, erasures, len(message))
+        locator = self._berlekamp_massey(forney, ec_words, len(erasures))
+        errors = self._chien_search(locator[::-1], len(message))
+        message = self._correct_errata(message, syndromes, erasures + errors)
+        if any(self.syndromes(message, ec_words)):
+            raise ReedSolomonError('Could not correct the block')
+        return message
+
+    def _poly_scale(self, poly, factor):
+        return [self.gf.multiply(c, factor) for c in poly]
+
+    def _poly_add(self, poly1, poly2):
+        # Both highest degree first, so they line up at the end
+        result = [0] * max(len(poly1), len(poly2))
+        for i, c in enumerate(poly1):
+            result[i + len(result) - len(poly1)] = c
+        for i, c in enumerate(poly2):
+            result[i + len(result) - len(poly2)] ^= c
+        return result
+
+    def _poly_eval(self, poly, x):
+        value = poly[0]
+        for c in poly[1:]:
+            value = self.gf.multiply(value, x) ^ c
+        return value
+
+    def _forney_syndromes(self, syndromes, erasures, length):
+        # Syndromes with the erasures taken out, so Berlekamp-Massey only sees unknown errors
+        forney = list(syndromes)
+        for position in erasures:
+            x = self.gf.power(2, length - 1 - position)
+            for j in range(len(forney) - 1):
+                forney[j] = self.gf.multiply(forney[j], x) ^ forney[j + 1]
+        return forney
+
+    def _berlekamp_massey(self, syndromes, ec_words, erasure_count):
+        """Error locator polynomial, highest degree first"""
+        locator = [1]
+        old_locator = [1]
+        for i in range(ec_words - erasure_count):
+            delta = syndromes[i]
+            for j in range(1, len(locator)):
+                delta ^= self.gf.multiply(locator[-(j + 1)], syndromes[i - j])
+            old_locator = old_locator + [0]
+            if delta != 0:
+                if len(old_locator) > len(locator):
+                    new_locator = self._poly_scale(old_locator, delta)
+                    old_locator = self._poly_scale(locator, self.gf.inverse(delta))
+                    locator = new_locator
+                locator = self._poly_add(locator, self._poly_scale(old_locator, delta))
+        while locator and locator[0] == 0:
+            del locator[0]
+        if (len(locator) - 1) * 2 + erasure_count > ec_words:
+            raise ReedSolomonError('Too many errors to correct')
+        return locator
+
+    def _chien_search(self, locator, length):
+        """Positions in the codeword where the reversed locator has a root"""
+        errors = [
+            length - 1 - i
+            for i in range(length)
+            if self._poly_eval(locator, self.gf.power(2, i)) == 0
+        ]
+        if len(errors) != len(locator) - 1:
+            raise ReedSolomonError('Could not locate the errors')
+        return errors
+
+    def _correct_errata(self, message, syndromes, positions):
+        """Forney algorithm, error magnitudes for known error and erasure positions"""
+        gf = self.gf
+        coefficient_positions = [len(message) - 1 - p for p in positions]
+        # Errata locator, product of (1 + X_i x)
+        locator = [1]
+        for p in coefficient_positions:
+            locator = self.generator_calc.multiply_polynomials(locator, [gf.power(2, p), 1])
+        # Errata evaluator, S(x) * locator(x) mod x^(number of syndromes)
+        product = self.generator_calc.multiply_polynomials(syndromes[::-1], locator)
+        evaluator = product[len(product) - len(syndromes):]
+        xs = [gf.power(2, p) for p in coefficient_positions]
+        corrected = list(message)
+        for i, x in enumerate(xs):
+            x_inv = gf.inverse(x)
+            derivative = 1
+            for j, other in enumerate(xs):
+                if j != i:
+                    derivative = gf.multiply(derivative, 1 ^ gf.multiply(x_inv, other))
+            if derivative == 0:
+                raise ReedSolomonError('Could not find the error magnitude')
+            # With the first root at α^0 the X_i factors of Forney's formula cancel out
+            corrected[positions[i]] ^= gf.divide(self._poly_eval(evaluator, x_inv), derivative)
+        return corrected
+
+RS_DECODER = ReedSolomonDecoder(RS_ENCODER.generator_calc)
 
 class QRErrorCorrection:
     """
@@ -316,6 +705,9 @@ class QRErrorCorrection:
         """Get RS block configuration for given version and EC level"""
         if version < 1 or version > 40 and ec_level not in EC_INDEX.keys():
             raise ValueError(f"Invalid version or EC level: {version}, {ec_level}")
+        if _tables is not None:
+            ec_words, data_words = _tables.BLOCK_LAYOUTS[(version, ec_level)]
+            return [RSBlock(total_words=data + ec_words, data_words=data) for data in data_words]
         # Get block config from the table
         config = RS_BLOCK_TABLE[(version - 1) * 4 + EC_INDEX[ec_level]]
         # Split by 3 to get each block configuration section separately
@@ -327,12 +719,26 @@ class QRErrorCorrection:
             for _ in range(count)
         ]
         
-    def __init__(self, version: int, ec_level: str):
+    def __init__(self, version: int, ec_level: str, backend: str = 'auto', prefix_cache: PrefixCache = None):
+        """
+        backend: 'python', 'numpy', or 'auto' to use NumPy when it's installed
+                 and the symbol has at least NUMPY_MIN_BLOCKS blocks
+        prefix_cache: Optional PrefixCache to resume blocks from, only used by the python backend
+        """
         self.version = version
         self.ec_level = ec_level.upper()
         
         self.blocks = self.get_block_config(version, self.ec_level)
-        self.encoder = ReedSolomonEncoder(GeneratorPolynomialCalculator())
+        self.encoder = RS_ENCODER
+        self.prefix_cache = prefix_cache
+        if backend == 'auto':
+            use_numpy = numpy_available() and len(self.blocks) >= NUMPY_MIN_BLOCKS and prefix_cache is None
+            backend = 'numpy' if use_numpy else 'python'
+        if backend not in ('python', 'numpy'):
+            raise ValueError(f'Unknown Reed-Solomon backend: {backend}')
+        if backend == 'numpy' and not numpy_available():
+            raise ImportError('The numpy backend requires numpy to be installed')
+        self.backend = backend
     
     def encode_data(self, data: List[int]) -> Tuple[List[List[int]], List[List[int]]]:
         """
@@ -344,18 +750,163 @@ class QRErrorCorrection:
         Returns:
             Tuple of (data blocks, error correction blocks)
         """
+        if self.backend == 'numpy' and len(data) >= sum(block.data_words for block in self.blocks):
+            return self._encode_data_numpy(data)
         data_blocks = []
         ec_blocks = []
         
         data_idx = 0
-        for block in self.blocks:
+        for block_index, block in enumerate(self.blocks):
             # Split data into blocks
             block_data = data[data_idx:data_idx + block.data_words]
             data_idx += block.data_words
             data_blocks.append(block_data)
             
             # Generate error correction words for each block
-            ec_words = self.encoder.encode_block(block_data, block.ec_words)
+            if self.prefix_cache is not None:
+                key = (self.version, self.ec_level, block_index)
+                ec_words = self.encoder.encode_block_cached(block_data, block.ec_words, self.prefix_cache, key)
+            else:
+                ec_words = self.encoder.encode_block(block_data, block.ec_words)
             ec_blocks.append(ec_words)
         
         return data_blocks, ec_blocks
+
+    def _encode_data_numpy(self, data):
+        """Same as encode_data, but every group of same length blocks is encoded in one go"""
+        np = load_numpy()
+        data_blocks = []
+        ec_blocks = []
+        data = np.frombuffer(bytes(data), dtype=np.uint8)
+        data_idx = 0
+        for count, total, data_words in self.get_raw_block_config(self.version, self.ec_level):
+            # Blocks of a group sit next to each other in the data, so this is just a reshape
+            group = data[data_idx:data_idx + count * data_words].reshape(count, data_words)
+            data_idx += count * data_words
+            data_blocks.extend(group.tolist())
+            ec_blocks.extend(self.encoder.encode_blocks(group, total - data_words).tolist())
+        return data_blocks, ec_blocks
+
+    def update_data(self, blocks, changes) -> Tuple[List[List[int]], List[List[int]]]:
+        """
+        Apply changed data words to already encoded blocks. Cost depends on the number
+        of changes, not on the size of the symbol.
+
+        Args:
+            blocks: (data blocks, error correction blocks) as returned by encode_data
+            changes: Mapping of data word index (before splitting into blocks) -> new value
+
+        Returns:
+            Tuple of updated (data blocks, error correction blocks), unchanged blocks are shared
+        """
+        data_blocks, ec_blocks = list(blocks[0]), list(blocks[1])
+        block_changes = {}
+        for index, value in changes.items():
+            block_index, position = self._locate(index)
+            delta = data_blocks[block_index][position] ^ value
+            if delta:
+                block_changes.setdefault(block_index, {})[position] = delta
+        for block_index, deltas in block_changes.items():
+            block_data = list(data_blocks[block_index])
+            for position, delta in deltas.items():
+                block_data[position] ^= delta
+            data_blocks[block_index] = block_data
+            ec_blocks[block_index] = self.encoder.update_block(
+                ec_blocks[block_index], self.blocks[block_index].data_words, deltas)
+        return data_blocks, ec_blocks
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        """Block number and position in the block of a data word index"""
+        if index < 0:
+            raise IndexError(f'Data word index out of range: {index}')
+        for block_index, block in enumerate(self.blocks):
+            if index < block.data_words:
+                return block_index, index
+            index -= block.data_words
+        raise IndexError('Data word index out of range')
+
+    def verify_data(self, data_blocks: List[List[int]], ec_blocks: List[List[int]]) -> bool:
+        """
+        Check every block of the symbol against its error correction words, without correcting anything.
+        A codeword has all zero syndromes exactly when re-encoding its data gives back its
+        error correction words, so this runs on the encoder's register, which is cheaper than
+        evaluating every syndrome. Use RS_DECODER to find out what is wrong with a block.
+        """
+        if self.backend == 'numpy':
+            np = load_numpy()
+            start = 0
+            for count, total, data_words in self.get_raw_block_config(self.version, self.ec_level):
+                group = np.array(data_blocks[start:start + count], dtype=np.uint8)
+                expected = np.array(ec_blocks[start:start + count], dtype=np.uint8)
+                start += count
+                if not np.array_equal(self.encoder.encode_blocks(group, total - data_words), expected):
+                    return False
+            return True
+        ec_words = len(ec_blocks[0]) if ec_blocks else 0
+        return all(
+            self.encoder.encode_block(data_block, ec_words) == list(ec_block)
+            for data_block, ec_block in zip(data_blocks, ec_blocks)
+        )
+
+    @staticmethod
+    def encode_batch(messages, backend: str = 'auto') -> List[Tuple[List[List[int]], List[List[int]]]]:
+        """
+        Encode many messages at once. Messages are bucketed by (version, EC level), which
+        fixes their block structure, and with NumPy every group of same length blocks across
+        the whole bucket is divided as one matrix, one row per block of every message.
+
+        Args:
+            messages: Iterable of (version, ec_level, data words) tuples
+            backend: 'python', 'numpy', or 'auto' to use NumPy when a bucket has
+                     at least NUMPY_MIN_BLOCKS blocks in total
+
+        Returns:
+            List of (data blocks, error correction blocks) tuples in the same order as messages
+        """
+        messages = list(messages)
+        buckets = {}
+        for index, (version, ec_level, data) in enumerate(messages):
+            buckets.setdefault((version, ec_level.upper()), []).append(index)
+
+        results = [None] * len(messages)
+        for (version, ec_level), indices in buckets.items():
+            qr_ec = QRErrorCorrection(version, ec_level, backend='python')
+            bucket_backend = backend
+            if bucket_backend == 'auto':
+                rows = len(indices) * len(qr_ec.blocks)
+                bucket_backend = 'numpy' if numpy_available() and rows >= NUMPY_MIN_BLOCKS else 'python'
+            capacity = sum(block.data_words for block in qr_ec.blocks)
+            if bucket_backend == 'numpy' and all(len(messages[i][2]) >= capacity for i in indices):
+                encoded = qr_ec._encode_batch_numpy([messages[i][2] for i in indices])
+            else:
+                encoded = [qr_ec.encode_data(messages[i][2]) for i in indices]
+            for index, result in zip(indices, encoded):
+                results[index] = result
+        return results
+
+    def _encode_batch_numpy(self, datas):
+        """encode_data for many messages of this version and EC level, needs NumPy"""
+        np = load_numpy()
+        if np is None:
+            raise ImportError('The numpy backend requires numpy to be installed')
+        capacity = sum(block.data_words for block in self.blocks)
+        # One row per message
+        stacked = np.frombuffer(b''.join(bytes(data[:capacity]) for data in datas), dtype=np.uint8)
+        stacked = stacked.reshape(len(datas), capacity)
+        data_parts = []
+        ec_parts = []
+        data_idx = 0
+        for count, total, data_words in self.get_raw_block_config(self.version, self.ec_level):
+            group = stacked[:, data_idx:data_idx + count * data_words]
+            data_idx += count * data_words
+            # Every block of every message becomes a row of one big division
+            rows = group.reshape(len(datas) * count, data_words)
+            ec = self.encoder.encode_blocks(rows, total - data_words)
+            data_parts.append(group.reshape(len(datas), count, data_words).tolist())
+            ec_parts.append(ec.reshape(len(datas), count, total - data_words).tolist())
+        results = []
+        for message in range(len(datas)):
+            data_blocks = [block for part in data_parts for block in part[message]]
+            ec_blocks = [block for part in ec_parts for block in part[message]]
+            results.append((data_blocks, ec_blocks))
+        return results
@@ -0,0 +1,48 @@
+## Serial numbered symbols, re-using the error correction of the previous symbol
+from typing import Iterator, Union
+
+from .bitset_grid import IncrementalScorer
+from .main import QRGenerator, PLACEMENTS
+from .reedsolomon import QRErrorCorrection
+
+def generate_range(template: str,
+                   start: int,
+                   stop: int,
+                   version: Union[int, str, None] = 'auto',
+                   ec_level: str = 'L',
+                   **kwargs) -> Iterator[QRGenerator]:
+    """
+    Generate one finished symbol per number in range(start, stop), with the data
+    being template.format(number), e.g. 'https://example.com/t/{:06d}'.
+
+    Consecutive payloads usually only differ in a few data words, so instead of
+    running Reed-Solomon over every block again only the changed words are applied
+    to the previous symbol's error correction. Whenever the version or the number of
+    data words changes the symbol is encoded from scratch.
+
+    The mask penalties are carried over the same way: an IncrementalScorer only
+    rescores the rows and columns holding modules that changed.
+    """
+    previous = None     # (version, codewords, blocks)
+    scorer = None
+    for number in range(start, stop):
+        qr = QRGenerator(data=template.format(number), version=version, ec_level=ec_level, **kwargs)
+        codewords = bytes(qr._pre_process_data().buffer)
+        qr_ec = QRErrorCorrection(version=qr.version, ec_level=qr.ec_level)
+        same_layout = previous is not None and previous[0] == qr.version and len(previous[1]) == len(codewords)
+        if same_layout:
+            changes = {i: new for i, (old, new) in enumerate(zip(previous[1], codewords)) if old != new}
+            qr.blocks = qr_ec.update_data(previous[2], changes)
+        else:
+            qr.blocks = qr_ec.encode_data(codewords)
+        qr.add_required_elements()
+        qr.place_data()
+        if same_layout and scorer is not None:
+            table = PLACEMENTS.get(qr.version, qr.ec_level.upper())
+            scorer.update(table.changed_modules(previous[2], qr.blocks))
+        else:
+            scorer = IncrementalScorer.from_modules(qr.modules, qr.template.mask_words)
+        previous = (qr.version, codewords, qr.blocks)
+        qr.apply_best_mask(scorer)
+        qr.add_metadata()
+        yield qr
@@ -0,0 +1,130 @@
+## Structured append, splitting one payload over a sequence of up to 16 symbols
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import reduce
+from operator import xor
+from typing import List, Optional, Union
+
+from PIL import Image
+
+from .encoders import as_bytes
+from .main import QRGenerator
+
+MAX_SYMBOLS = 16
+
+def parity_byte(data) -> int:
+    """XOR of every byte of the data, strings are taken as utf-8"""
+    return reduce(xor, as_bytes(data), 0)
+
+def split_data(data, count: int) -> list:
+    """
+    Split data into count parts of (nearly) equal length.
+    Strings are split on characters so multi-byte characters stay whole.
+    """
+    if not isinstance(data, str):
+        data = bytes(as_bytes(data))
+    size, extra = divmod(len(data), count)
+    parts = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        parts.append(data[start:end])
+        start = end
+    return parts
+
+def _build_symbol(data, ec_level, kwargs) -> QRGenerator:
+    # Module level so it can be sent to worker processes
+    qr = QRGenerator(data=data, version='auto', ec_level=ec_level, **kwargs)
+    qr.add_required_elements()
+    qr.place_data()
+    qr.apply_best_mask()
+    qr.add_metadata()
+    return qr
+
+class StructuredAppend:
+    """
+    Splits data that is too big (or too slow) for a single symbol across a sequence
+    of symbols. Every symbol carries its position, the sequence length and the parity
+    of the whole payload, so a reader can put the data back together in order.
+    """
+    def __init__(self,
+                 data: Union[str, bytes, bytearray, memoryview],
+                 ec_level: str = 'L',
+                 max_version: int = 40,
+                 **kwargs):
+        self.data = data
+        self.ec_level = ec_level
+        self.max_version = max_version
+        self.parity = parity_byte(data)
+        self.kwargs = kwargs
+        self.symbols = []
+        self.parts, self.versions = self._plan()
+
+    def _plan(self):
+        """
+        Find the fewest equal parts that each fit in max_version.
+        Equal parts keep the symbol versions balanced instead of one big and one tiny symbol.
+        """
+        for count in range(1, MAX_SYMBOLS + 1):
+            parts = split_data(self.data, count)
+            versions = []
+            for index, part in enumerate(parts):
+                try:
+                    version = QRGenerator(data=part, version='auto', ec_level=self.ec_level,
+                                          structured_append=(index, count, self.parity)).version
+                except ValueError:
+                    break
+                if version > self.max_version:
+                    break
+                versions.append(version)
+            else:
+                return parts, versions
+        raise ValueError(f'Data too long for {MAX_SYMBOLS} symbols of version {self.max_version} '
+                         f'with error correction level {self.ec_level}')
+
+    def generate(self, executor: Optional[Executor] = None, workers: Optional[int] = None) -> List[QRGenerator]:
+        """
+        Build every symbol of the sequence, in parallel when there is more than one.
+
+        Args:
+            executor: Executor to submit the symbols to, a process pool is created when not given
+            workers: Number of worker processes for the default pool
+
+        Returns:
+            List of finished QRGenerator objects, in sequence order
+        """
+        count = len(self.parts)
+        jobs = [
+            (part, self.ec_level, dict(self.kwargs, structured_append=(index, count, self.parity)))
+            for index, part in enumerate(self.parts)
+        ]
+        if count == 1:
+            self.symbols = [_build_symbol(*jobs[0])]
+        elif executor is not None:
+            self.symbols = list(executor.map(_build_symbol, *zip(*jobs)))
+        else:
+            with ProcessPoolExecutor(max_workers=min(count, workers) if workers else None) as pool:
+                self.symbols = list(pool.map(_build_symbol, *zip(*jobs)))
+        return self.symbols
+
+    def create_image(self, spacing: int = 0) -> Image.Image:
+        """Render the symbols left to right as one strip image"""
+        if not self.symbols:
+            self.generate()
+        images = []
+        for symbol in self.symbols:
+            symbol._add_dead_zones()
+            images.append(symbol.create_image().image)
+        width = sum(image.width for image in images) + spacing * (len(images) - 1)
+        height = max(image.height for image in images)
+        strip = Image.new('RGB', (width, height), 'white')
+        x = 0
+        for image in images:
+            strip.paste(image, (x, 0))
+            x += image.width + spacing
+        return strip
+
+    def show(self, spacing: int = 0):
+        self.create_image(spacing).show()
+
+    def save(self, filename, spacing: int = 0):
+        self.create_image(spacing).save(filename)
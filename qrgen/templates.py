@@ -0,0 +1,148 @@
+## Function pattern templates. Everything but the data and the format info only depends on the
+## version, so it's built once per version and every new symbol starts from a copy.
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from .bitset_grid import flip_words
+from .mask_patterns import mask_patterns
+from .reedsolomon import CacheInfo
+from .utils import load_numpy
+
+# What every module of a symbol is for
+ROLE_DATA = 0
+ROLE_FUNCTION = 1       # Finders, separators, timing, alignment and the dark module
+ROLE_FORMAT = 2
+ROLE_VERSION = 3
+
+@dataclass
+class SymbolTemplate:
+    version: int
+    size: int
+    # The function pattern layer as add_required_elements leaves it: None on data modules,
+    # 2 on the reserved format modules
+    modules: List[list]
+    # True on data modules. Shared by every symbol of the version, so never write to it
+    data_mask: List[List[bool]]
+    # Row-major ROLE_* of every module
+    roles: bytes
+    # Row-major index of every data module, in the order place_data fills them
+    data_order: array
+    # Row-major index of the format info modules, both copies in bit order
+    format_order: Tuple[array, array]
+    arrays: tuple = field(default=None, repr=False)
+    # The data modules every mask pattern flips, built on first use. Like the rest of the
+    # template they only depend on the version
+    flips: list = field(default=None, repr=False)
+    words: list = field(default=None, repr=False)
+    planes: object = field(default=None, repr=False)
+
+    def new_modules(self) -> List[list]:
+        """A fresh grid for a new symbol, only the row lists are copied"""
+        return [row[:] for row in self.modules]
+
+    def as_arrays(self):
+        """
+        (modules, data) NumPy arrays: uint8 modules with 0 on the data modules,
+        and a bool plane that is True on the data modules. Shared, copy before writing.
+        """
+        if self.arrays is None:
+            np = load_numpy()
+            roles = np.frombuffer(self.roles, dtype=np.uint8).reshape(self.size, self.size)
+            modules = np.array([[0 if item is None else item for item in row] for row in self.modules], dtype=np.uint8)
+            self.arrays = (modules, roles == ROLE_DATA)
+        return self.arrays
+
+    def mask_flips(self, pattern_number: int) -> List[List[int]]:
+        """Columns of the modules a mask pattern flips, one list per row"""
+        if self.flips is None:
+            self.flips = [
+                [[j for j in range(self.size) if self.data_mask[i][j] and mask(i, j)] for i in range(self.size)]
+                for mask in mask_patterns
+            ]
+        return self.flips[pattern_number]
+
+    def mask_words(self, pattern_number: int) -> Tuple[List[int], List[int]]:
+        """(row words, column words) of a mask pattern, for BitsetGrid"""
+        if self.words is None:
+            self.words = [flip_words(self.mask_flips(k), self.size) for k in range(len(mask_patterns))]
+        return self.words[pattern_number]
+
+    def mask_planes(self):
+        """(8, size, size) uint8 NumPy array with a 1 on every module each mask pattern flips"""
+        if self.planes is None:
+            np = load_numpy()
+            i, j = np.indices((self.size, self.size))
+            data = self.as_arrays()[1]
+            self.planes = np.stack([mask(i, j) & data for mask in mask_patterns]).astype(np.uint8)
+        return self.planes
+
+    def role(self, row: int, column: int) -> int:
+        return self.roles[row * self.size + column]
+
+    def nbytes(self) -> int:
+        """
+        Approximate memory held by the template, the lazily built mask caches included.
+        Module values and column numbers are shared small int singletons so only containers count,
+        the mask words are big ints of their own
+        """
+        total = (sys.getsizeof(self.modules) + sum(sys.getsizeof(row) for row in self.modules)
+                 + sys.getsizeof(self.data_mask) + sum(sys.getsizeof(row) for row in self.data_mask)
+                 + sys.getsizeof(self.roles) + sys.getsizeof(self.data_order)
+                 + sum(sys.getsizeof(order) for order in self.format_order))
+        if self.arrays is not None:
+            total += sum(array.nbytes for array in self.arrays)
+        if self.flips is not None:
+            total += sys.getsizeof(self.flips) + sum(
+                sys.getsizeof(rows) + sum(sys.getsizeof(row) for row in rows) for rows in self.flips)
+        if self.words is not None:
+            total += sys.getsizeof(self.words) + sum(
+                sys.getsizeof(pair) + sum(sys.getsizeof(words) + sum(map(sys.getsizeof, words)) for words in pair)
+                for pair in self.words)
+        if self.planes is not None:
+            total += self.planes.nbytes
+        return total
+
+class TemplateCache:
+    """
+    Process wide cache of SymbolTemplates by version. Templates are built on first use
+    by `builder`, or up front with preload.
+    """
+    def __init__(self, builder: Callable[[int], SymbolTemplate]):
+        self.builder = builder
+        self.templates: Dict[int, SymbolTemplate] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, version: int) -> SymbolTemplate:
+        template = self.templates.get(version)
+        if template is None:
+            self.misses += 1
+            template = self.builder(version)
+            self.templates[version] = template
+        else:
+            self.hits += 1
+        return template
+
+    def preload(self, versions: Iterable[int] = range(1, 41)):
+        """
+        Build the templates for these versions now instead of on first use.
+        Preloaded templates count as neither a hit nor a miss, only get calls do.
+        """
+        for version in versions:
+            if version not in self.templates:
+                self.templates[version] = self.builder(version)
+
+    def memory_footprint(self) -> int:
+        """Approximate bytes held by all cached templates"""
+        return sum(template.nbytes() for template in self.templates.values())
+
+    def cache_info(self) -> CacheInfo:
+        """Hits and misses of get. There's no bound, one template per version is kept, so maxsize is None"""
+        return CacheInfo(self.hits, self.misses, None, len(self.templates))
+
+    def clear(self):
+        self.templates.clear()
+        self.hits = 0
+        self.misses = 0
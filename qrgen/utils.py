@@ -1,3 +1,5 @@
+from importlib.util import find_spec
+
 
 alignment_patterns = [
     [],         # Version 1 - No alignment patterns
@@ -85,3 +87,29 @@ def interleave_blocks_broken(data_blocks):
     for group in zip(*data_blocks):
         interleaved.extend(list(group))
     return interleaved
+
+
+_numpy = None
+
+def numpy_available():
+    """Whether NumPy can be imported, without paying for the import"""
+    if _numpy is not None:
+        return True
+    try:
+        return find_spec('numpy') is not None
+    except ValueError:      # Already imported, or blocked, without a spec
+        return load_numpy() is not None
+
+def load_numpy():
+    """
+    NumPy is optional and slow to import, so it's only imported the first time it's needed.
+    Returns None when it isn't installed.
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            return None
+        _numpy = numpy
+    return _numpy
@@ -0,0 +1,89 @@
+import random
+import warnings
+
+import pytest
+
+from conftest import finished_symbol
+from qrgen import MatrixDecoder, DecodeError
+from qrgen.decoder import parse_segments
+from qrgen.encoders import ALPHANUM, BitStream, NumericEncoder
+from qrgen.utils import load_numpy
+
+def random_payload(rng: random.Random) -> str:
+    parts = []
+    for _ in range(rng.randint(1, 6)):
+        charset = rng.choice(['0123456789', ALPHANUM, 'abcdefghijklmnop@#/?', '漢字日本語'])
+        parts.append(''.join(rng.choice(charset) for _ in range(rng.randint(1, 40))))
+    return ''.join(parts)
+
+def test_round_trip():
+    """Mixed-mode symbols decode back to their own text, version, EC level and mask"""
+    decoder = MatrixDecoder()
+    rng = random.Random(7)
+    backends = ['list', 'numpy'] if load_numpy() is not None else ['list']
+    count = 0
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for i in range(300):
+            payload = random_payload(rng)
+            ec_level = 'LMQH'[i % 4]
+            for backend in backends:
+                qr = finished_symbol(payload, ec_level=ec_level, backend=backend)
+                decoded = decoder.decode(qr.modules)
+                where = f"{payload!r} {ec_level} {backend}"
+                assert decoded.text == payload, f"{where} decoded as {decoded.text!r}"
+                assert (decoded.version, decoded.ec_level, decoded.mask_pattern) == (qr.version, ec_level, qr.mask_pattern), where
+                assert not decoded.corrected, where
+                assert decoder.verify(qr), where
+                count += 1
+    print(f"✓ {count} mixed-mode symbols decode back to their payload")
+
+def test_short_terminator_rejected():
+    """The old shortened terminator put pad codewords off the byte boundary, it must not parse"""
+    stream = NumericEncoder('1234567').encode(qr_version=1)     # 38 bits
+    stream.put(0, 2)
+    stream.put_bytes(bytes(BitStream.PADDING * 7)[:14])
+    with pytest.raises(DecodeError):
+        parse_segments(bytes(stream), 1)
+    print("✓ Shortened terminator is rejected")
+
+def test_numeric_group_range():
+    """10, 7 and 4 bit numeric groups must stay below 1000, 100 and 10"""
+    for digits, group, width in ((3, 1000, 10), (2, 100, 7), (1, 10, 4)):
+        stream = BitStream()
+        stream.put(NumericEncoder.MODE, 4)
+        stream.put(digits, NumericEncoder.SMALL)
+        stream.put(group, width)
+        stream.pad_to_length(19 * 8)
+        with pytest.raises(DecodeError):
+            parse_segments(bytes(stream), 1)
+        # The largest valid group still parses
+        stream = NumericEncoder(str(group - 1)).encode(qr_version=1)
+        stream.pad_to_length(19 * 8)
+        segments, _ = parse_segments(bytes(stream), 1)
+        assert [segment.data for segment in segments] == [str(group - 1)], segments
+    print("✓ Out of range numeric groups are rejected")
+
+def test_spec_padding_accepted():
+    """0000 terminator, zero fill and pad codewords, and a terminator cut short at capacity"""
+    for payload, capacity in (('1234567', 19), ('12345678', 4)):
+        stream = NumericEncoder(payload).encode(qr_version=1)
+        stream.pad_to_length(capacity * 8)
+        segments, header = parse_segments(bytes(stream), 1)
+        assert [segment.data for segment in segments] == [payload], f"{payload!r} in {capacity} codewords parsed as {segments}"
+        assert header is None
+    print("✓ Spec padding parses")
+
+def test_strided_memoryview():
+    """Non-contiguous memoryviews are copied out and encode like the bytes they hold"""
+    data = memoryview(b'https://example.com/strided')[::2]
+    qr = finished_symbol(data)
+    assert MatrixDecoder().decode(qr.modules).raw == data.tobytes()
+    print("✓ Strided memoryview round trips")
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_short_terminator_rejected()
+    test_numeric_group_range()
+    test_spec_padding_accepted()
+    test_strided_memoryview()
@@ -0,0 +1,74 @@
+import os
+import random
+import tempfile
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+from conftest import finished_symbol
+from qrgen import QRGenerator, read_directory, read_image
+from qrgen.decoder import DecodeError
+from qrgen.utils import load_numpy
+
+def saved_symbol(directory, name, payload, **kwargs) -> QRGenerator:
+    qr = finished_symbol(payload, **kwargs)
+    qr.save(os.path.join(directory, name))
+    return qr
+
+def cases():
+    """(file name, payload, QRGenerator kwargs) over several versions, module sizes 1-8 and paddings"""
+    rng = random.Random(1)
+    backends = ['list', 'numpy'] if load_numpy() is not None else ['list']
+    result = []
+    for i, version in enumerate((1, 2, 5, 7, 10, 14, 20, 27)):
+        payload = 'https://example.com/' + ''.join(rng.choice('abcdefgh0123') for _ in range(8 * version))
+        kwargs = dict(ec_level='LMQH'[i % 4], module_size=i + 1,
+                      padding=(4, 0, 1, 7)[i % 4], backend=backends[i % len(backends)])
+        result.append((f'symbol_{i}.png', payload, kwargs))
+    return result
+
+def test_read_image():
+    """Saved symbols read back to their payload, version and mask"""
+    with tempfile.TemporaryDirectory() as directory, warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for name, payload, kwargs in cases():
+            qr = saved_symbol(directory, name, payload, **kwargs)
+            decoded = read_image(os.path.join(directory, name))
+            where = f"{name} v{qr.version} module size {kwargs['module_size']} padding {kwargs['padding']}"
+            assert decoded.text == payload, f"{where} read as {decoded.text!r}"
+            assert (decoded.version, decoded.ec_level, decoded.mask_pattern) == (qr.version, qr.ec_level, qr.mask_pattern), where
+    print("✓ Saved symbols read back at every module size and padding")
+
+def test_read_directory():
+    """Every file gets a result in name order, bad files come back as per-file errors"""
+    with tempfile.TemporaryDirectory() as directory, warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        payloads = {}
+        for name, payload, kwargs in cases():
+            saved_symbol(directory, name, payload, **kwargs)
+            payloads[os.path.join(directory, name)] = payload
+        # A truncated PNG and an image that isn't a QR code
+        with open(os.path.join(directory, 'symbol_0.png'), 'rb') as file:
+            truncated = file.read()[:60]
+        with open(os.path.join(directory, 'broken.png'), 'wb') as file:
+            file.write(truncated)
+        image = Image.new('RGB', (90, 60), 'white')
+        image.paste((0, 0, 0), (10, 10, 50, 40))
+        image.save(os.path.join(directory, 'not_a_symbol.png'))
+        bad = {os.path.join(directory, 'broken.png'), os.path.join(directory, 'not_a_symbol.png')}
+
+        with ThreadPoolExecutor() as executor:
+            for results in (read_directory(directory), read_directory(directory, executor=executor)):
+                assert [result.path for result in results] == sorted(payloads.keys() | bad)
+                for result in results:
+                    if result.path in bad:
+                        assert result.symbol is None and isinstance(result.error, (OSError, DecodeError)), result
+                    else:
+                        assert result.error is None, result
+                        assert result.symbol.text == payloads[result.path], result.path
+    print("✓ read_directory reads good files and reports bad ones")
+
+if __name__ == "__main__":
+    test_read_image()
+    test_read_directory()
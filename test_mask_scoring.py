@@ -0,0 +1,63 @@
+import random
+
+from conftest import masked_copy, placed_symbol, reference_breakdown
+from qrgen import QRGenerator
+from qrgen.array_grid import penalty_breakdown
+from qrgen.bitset_grid import BitsetGrid
+from qrgen.reedsolomon import get_codeword_capacity
+from qrgen.utils import load_numpy
+
+def test_every_version():
+    """BitsetGrid and ArrayGrid give the same penalties as mask_patterns for every version, EC level and mask"""
+    np = load_numpy()
+    rng = random.Random(1)
+    checks = 0
+    for version in range(1, 41):
+        for ec_level in 'LMQH':
+            # Byte mode takes 2 or 3 codewords of header, leave room for it
+            payload = bytes(rng.randrange(256) for _ in range(get_codeword_capacity(version, ec_level) - 3))
+            qr = placed_symbol(payload, version, ec_level, 'list')
+            bitsets = BitsetGrid.from_modules(qr.modules)
+            expected = [reference_breakdown(masked_copy(qr.modules, qr.data_mask, k)) for k in range(8)]
+            found = [bitsets.masked(*qr.template.mask_words(k)).penalty_breakdown() for k in range(8)]
+            assert found == expected, f"BitsetGrid differs for {version}-{ec_level}: {found} != {expected}"
+            checks += 8
+            if np is None:
+                continue
+            grid = placed_symbol(payload, version, ec_level, 'numpy').grid
+            found = [tuple(breakdown) for breakdown in grid.mask_breakdowns()]
+            assert found == expected, f"ArrayGrid differs for {version}-{ec_level}: {found} != {expected}"
+            # conditions yields them cheapest first, N4 N2 N1 N3
+            for k, (n1, n2, n3, n4) in enumerate(expected):
+                assert list(grid.conditions(k)) == [n4, n2, n1, n3], \
+                    f"ArrayGrid.conditions differs for {version}-{ec_level} mask {k}"
+            checks += 8
+    print(f"✓ {checks} masked grids score the same as mask_patterns")
+
+def test_random_grids():
+    """Any grid of 0, 1, 2, True and False, with runs and finder patterns at the edges"""
+    np = load_numpy()
+    rng = random.Random(2)
+    for _ in range(300):
+        size = rng.choice([21, 25, 29, 45, 57])
+        # Skewed towards long runs so condition 1 and 3 are hit often
+        modules = [[rng.choice([0, 1, True, False, 2, 1, 1, 0, 0]) for _ in range(size)] for _ in range(size)]
+        expected = reference_breakdown(modules)
+        assert BitsetGrid.from_modules(modules).penalty_breakdown() == expected, \
+            f"BitsetGrid differs on a random {size}x{size} grid"
+        if np is not None:
+            assert tuple(penalty_breakdown(np.array(modules, dtype=np.uint8))) == expected, \
+                f"ArrayGrid differs on a random {size}x{size} grid"
+    print("✓ Random grids score the same as mask_patterns")
+
+def test_unplaced_grid():
+    """BitsetGrid refuses grids that still hold None, callers fall back to ListScorer"""
+    qr = QRGenerator(data='HELLO', version=1, ec_level='M', grid_backend='list')
+    qr.add_required_elements()
+    assert BitsetGrid.from_modules(qr.modules) is None, "BitsetGrid accepted a grid with unplaced data modules"
+    print("✓ BitsetGrid refuses unplaced grids")
+
+if __name__ == "__main__":
+    test_every_version()
+    test_random_grids()
+    test_unplaced_grid()
@@ -0,0 +1,121 @@
+import random
+
+from conftest import finished_symbol, masked_copy, placed_symbol, reference_breakdown, reference_scores
+from qrgen import generate_range
+from qrgen.bitset_grid import IncrementalScorer
+from qrgen.mask_selection import BranchAndBoundStrategy, DeadlineStrategy, ExhaustiveStrategy, ReuseStrategy
+from qrgen.reedsolomon import get_codeword_capacity
+from qrgen.utils import load_numpy
+
+def lowest(scores):
+    # Ties go to the lowest mask number
+    return scores.index(min(scores))
+
+def strategies():
+    return [
+        ExhaustiveStrategy(),
+        BranchAndBoundStrategy(),
+        BranchAndBoundStrategy(order=[7, 3, 5, 1, 0, 2, 4, 6]),
+        DeadlineStrategy(60.0, order=[6, 5, 4, 3, 2, 1, 0, 7]),
+        ReuseStrategy(),
+    ]
+
+def test_strategies():
+    """Every strategy with enough time picks the exhaustive mask, and every score it keeps is exact"""
+    rng = random.Random(1)
+    backends = ['list', 'numpy'] if load_numpy() is not None else ['list']
+    runs = 0
+    for version in range(1, 41, 3):
+        for ec_level in 'LMQH':
+            payload = bytes(rng.randrange(256) for _ in range(get_codeword_capacity(version, ec_level) - 3))
+            reference = placed_symbol(payload, version, ec_level)
+            expected = reference_scores(reference.modules, reference.data_mask)
+            for backend in backends:
+                for strategy in strategies():
+                    qr = placed_symbol(payload, version, ec_level, backend, mask_strategy=strategy)
+                    qr.apply_best_mask()
+                    runs += 1
+                    choice = qr.mask_choice
+                    assert qr.mask_pattern == lowest(expected) == choice.mask, \
+                        f"{strategy.name} ({backend}) picked mask {qr.mask_pattern} for {version}-{ec_level}, " \
+                        f"exhaustive picks {lowest(expected)}"
+                    assert all(score is None or score == expected[k] for k, score in enumerate(choice.scores)), \
+                        f"{strategy.name} ({backend}) kept wrong scores for {version}-{ec_level}: {choice.scores}"
+    print(f"✓ {runs} strategy runs pick the exhaustive mask")
+
+def test_deadline_spent():
+    """With no time left DeadlineStrategy still scores the first mask of its order to the end"""
+    qr = placed_symbol('https://example.com/' + 'x' * 450, 15, 'L', mask_strategy=DeadlineStrategy(0.0, order=[5, 0]))
+    qr.apply_best_mask()
+    assert qr.mask_pattern == 5 and qr.mask_choice.scores[5] is not None, f"DeadlineStrategy(0.0) picked {qr.mask_choice}"
+    print("✓ DeadlineStrategy with a spent budget returns its first mask")
+
+def test_reuse():
+    """ReuseStrategy searches in full the first time, then keeps the mask while it stays within tolerance"""
+    rng = random.Random(2)
+    tolerance = 20
+    strategy = ReuseStrategy(tolerance=tolerance)
+    searches = 0
+    for i in range(40):
+        payload = 'https://example.com/t/' + ''.join(rng.choice('abcdefghijklmnop') for _ in range(18))
+        qr = placed_symbol(payload, 3, 'M', mask_strategy=strategy)
+        expected = reference_scores(qr.modules, qr.data_mask)
+        previous = strategy.previous.get(3)
+        qr.apply_best_mask()
+        if previous is None or expected[previous[0]] > previous[1] + tolerance:
+            searches += 1
+            wanted = lowest(expected)
+        else:
+            wanted = previous[0]
+        assert qr.mask_pattern == wanted, f"ReuseStrategy picked {qr.mask_pattern} for symbol {i}, scores {expected}, kept {previous}"
+        assert qr.mask_choice.scores[qr.mask_pattern] == expected[qr.mask_pattern], qr.mask_choice
+    # Both branches were taken
+    assert 1 < searches < 40, searches
+    print(f"✓ ReuseStrategy keeps its mask while it's within tolerance ({searches} full searches for 40 symbols)")
+
+def test_incremental_scorer():
+    """IncrementalScorer after random data changes matches scoring the changed grid from scratch"""
+    rng = random.Random(3)
+    checks = 0
+    for version in (1, 4, 7, 15, 27):
+        payload = bytes(rng.randrange(256) for _ in range(get_codeword_capacity(version, 'L') - 3))
+        qr = placed_symbol(payload, version, 'L')
+        grid = [row[:] for row in qr.modules]
+        scorer = IncrementalScorer.from_modules(grid, qr.template.mask_words)
+        data = [(i, j) for i in range(qr.size) for j in range(qr.size) if qr.data_mask[i][j]]
+        for _ in range(12):
+            changes = [(i, j, rng.randint(0, 1)) for i, j in rng.sample(data, rng.choice([1, 5, 40]))]
+            for i, j, value in changes:
+                grid[i][j] = value
+            scorer.update(changes)
+            for k in range(8):
+                expected = reference_breakdown(masked_copy(grid, qr.data_mask, k))
+                assert scorer.breakdown(k) == expected, \
+                    f"IncrementalScorer differs for version {version} mask {k}: {scorer.breakdown(k)} != {expected}"
+                checks += 1
+            expected = reference_scores(grid, qr.data_mask)
+            for strategy in strategies()[:4]:
+                assert strategy.select(scorer, version).mask == lowest(expected), \
+                    f"{strategy.name} on an IncrementalScorer misses the exhaustive mask for version {version}"
+    print(f"✓ IncrementalScorer matches a full rescore ({checks} breakdowns)")
+
+def test_generate_range():
+    """Serial symbols come out the same as building each one on its own"""
+    backends = ['list', 'numpy'] if load_numpy() is not None else ['list']
+    template = 'https://example.com/t/{:06d}'
+    count = 0
+    for backend in backends:
+        for qr in generate_range(template, 99990, 100070, ec_level='M', grid_backend=backend):
+            fresh = finished_symbol(qr.data, backend=backend)
+            assert [[int(module) for module in row] for row in fresh.modules] == \
+                   [[int(module) for module in row] for row in qr.modules], f"generate_range ({backend}) differs for {qr.data!r}"
+            assert fresh.mask_pattern == qr.mask_pattern, f"generate_range ({backend}) picked another mask for {qr.data!r}"
+            count += 1
+    print(f"✓ {count} serial symbols match symbols built on their own")
+
+if __name__ == "__main__":
+    test_strategies()
+    test_deadline_spent()
+    test_reuse()
+    test_incremental_scorer()
+    test_generate_range()
@@ -0,0 +1,111 @@
+import random
+
+import pytest
+from reedsolo import RSCodec
+
+from qrgen.reedsolomon import RS_ENCODER, PrefixCache, QRErrorCorrection, get_codeword_capacity
+from qrgen.utils import load_numpy
+
+EC_LEVELS = 'LMQH'
+
+def reference_encode(qr_ec: QRErrorCorrection, data: bytes):
+    """Every block through ReedSolomonEncoder.encode_block one at a time"""
+    data_blocks, ec_blocks = [], []
+    start = 0
+    for block in qr_ec.blocks:
+        block_data = list(data[start:start + block.data_words])
+        start += block.data_words
+        data_blocks.append(block_data)
+        ec_blocks.append(RS_ENCODER.encode_block(block_data, block.ec_words))
+    return data_blocks, ec_blocks
+
+def as_lists(blocks):
+    # The python backend keeps slices of whatever it was given, compare plain lists
+    data_blocks, ec_blocks = blocks
+    return [list(block) for block in data_blocks], [list(block) for block in ec_blocks]
+
+def random_data(rng: random.Random, version: int, ec_level: str) -> bytes:
+    return bytes(rng.randrange(256) for _ in range(get_codeword_capacity(version, ec_level)))
+
+def test_encode_block_matches_reedsolo():
+    """The table-driven register gives the same error correction words as reedsolo"""
+    rng = random.Random(1)
+    for ec_words in (7, 10, 13, 15, 16, 17, 18, 20, 22, 24, 26, 28, 30):
+        for length in (1, 15, 54, 122):
+            data = bytes(rng.randrange(256) for _ in range(length))
+            assert RS_ENCODER.encode_block(list(data), ec_words) == list(RSCodec(ec_words).encode(data)[-ec_words:]), \
+                f"encode_block differs from reedsolo for {length} data words, {ec_words} EC words"
+    print("✓ encode_block matches reedsolo")
+
+def test_numpy_backend():
+    """encode_data with the NumPy backend matches encode_block, and verify_data accepts it"""
+    pytest.importorskip('numpy')
+    rng = random.Random(2)
+    for version in range(1, 41):
+        for ec_level in EC_LEVELS:
+            data = random_data(rng, version, ec_level)
+            qr_ec = QRErrorCorrection(version, ec_level, backend='numpy')
+            blocks = qr_ec.encode_data(data)
+            assert as_lists(blocks) == reference_encode(qr_ec, data), f"NumPy backend differs for {version}-{ec_level}"
+            assert qr_ec.verify_data(*blocks), f"NumPy verify_data rejects its own output for {version}-{ec_level}"
+    print("✓ NumPy backend matches encode_block for every version and EC level")
+
+def test_encode_batch():
+    """encode_batch gives every message the same blocks as encoding it on its own, in order"""
+    rng = random.Random(3)
+    messages = [(version, ec_level, random_data(rng, version, ec_level))
+                for version in rng.sample(range(1, 41), 12) for ec_level in EC_LEVELS for _ in range(5)]
+    rng.shuffle(messages)
+    backends = ['python', 'numpy'] if load_numpy() is not None else ['python']
+    for backend in backends:
+        results = QRErrorCorrection.encode_batch(messages, backend=backend)
+        for (version, ec_level, data), result in zip(messages, results):
+            expected = reference_encode(QRErrorCorrection(version, ec_level, backend='python'), data)
+            assert as_lists(result) == expected, f"encode_batch ({backend}) differs for {version}-{ec_level}"
+    print(f"✓ encode_batch matches encode_block with {' and '.join(backends)}")
+
+def test_prefix_cache():
+    """Payloads sharing a prefix give the same blocks with and without the cache, and hit it"""
+    rng = random.Random(4)
+    cache = PrefixCache(maxsize=64, interval=8)
+    prefix = bytes(rng.randrange(256) for _ in range(300))
+    blocks = 0
+    for version, ec_level in ((5, 'L'), (10, 'M'), (25, 'Q'), (40, 'H')):
+        capacity = get_codeword_capacity(version, ec_level)
+        qr_ec = QRErrorCorrection(version, ec_level, backend='python', prefix_cache=cache)
+        for _ in range(10):
+            suffix = bytes(rng.randrange(256) for _ in range(rng.randint(1, 40)))
+            data = (prefix + suffix * capacity)[:capacity]
+            assert as_lists(qr_ec.encode_data(data)) == reference_encode(qr_ec, data), \
+                f"Prefix cache changes the blocks of {version}-{ec_level}"
+            blocks += len(qr_ec.blocks)
+    info = cache.cache_info()
+    # One hit or miss per encoded block
+    assert info.hits + info.misses == blocks, info
+    assert info.hits, info
+    assert info.currsize <= info.maxsize, info
+    print(f"✓ Prefix cache matches encode_block ({info.hits} hits, {info.misses} misses)")
+
+def test_update_data():
+    """update_data after random changes gives the same blocks as encoding the new data"""
+    rng = random.Random(5)
+    for version in range(1, 41, 3):
+        for ec_level in EC_LEVELS:
+            data = bytearray(random_data(rng, version, ec_level))
+            qr_ec = QRErrorCorrection(version, ec_level, backend='python')
+            blocks = qr_ec.encode_data(bytes(data))
+            for _ in range(4):
+                changes = {rng.randrange(len(data)): rng.randrange(256) for _ in range(rng.randint(1, 12))}
+                for index, value in changes.items():
+                    data[index] = value
+                blocks = qr_ec.update_data(blocks, changes)
+                assert as_lists(blocks) == reference_encode(qr_ec, bytes(data)), \
+                    f"update_data differs from a full encode for {version}-{ec_level}"
+    print("✓ update_data matches a full encode")
+
+if __name__ == "__main__":
+    test_encode_block_matches_reedsolo()
+    test_numpy_backend()
+    test_encode_batch()
+    test_prefix_cache()
+    test_update_data()
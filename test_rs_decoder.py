@@ -0,0 +1,84 @@
+import random
+
+from qrgen.reedsolomon import RS_DECODER, RS_ENCODER, QRErrorCorrection, ReedSolomonError
+from qrgen.utils import load_numpy
+
+def block_sizes():
+    """Every distinct (data words, EC words) block of every version and EC level"""
+    return sorted({(block.data_words, block.ec_words)
+                   for version in range(1, 41) for ec_level in 'LMQH'
+                   for block in QRErrorCorrection.get_block_config(version, ec_level)})
+
+def random_codeword(rng: random.Random, data_words: int, ec_words: int):
+    data = [rng.randrange(256) for _ in range(data_words)]
+    return data + RS_ENCODER.encode_block(data, ec_words)
+
+def corrupt(rng: random.Random, codeword, positions):
+    damaged = list(codeword)
+    for position in positions:
+        damaged[position] ^= rng.randrange(1, 256)
+    return damaged
+
+def test_errors():
+    """Up to ec_words // 2 errors at unknown positions are corrected"""
+    rng = random.Random(1)
+    for data_words, ec_words in block_sizes():
+        codeword = random_codeword(rng, data_words, ec_words)
+        for count in {0, 1, ec_words // 2}:
+            damaged = corrupt(rng, codeword, rng.sample(range(len(codeword)), count))
+            corrected = RS_DECODER.decode_block(damaged, ec_words)
+            assert corrected == codeword, f"{count} errors in a {data_words}+{ec_words} block were not corrected"
+    print("✓ Errors are corrected up to capacity")
+
+def test_errors_and_erasures():
+    """Any mix with 2 * errors + erasures <= ec_words is corrected, erasures may hold any value"""
+    rng = random.Random(2)
+    for data_words, ec_words in block_sizes():
+        codeword = random_codeword(rng, data_words, ec_words)
+        for errors in range(0, ec_words // 2 + 1, max(1, ec_words // 8)):
+            erasures = ec_words - 2 * errors
+            positions = rng.sample(range(len(codeword)), errors + erasures)
+            erased = positions[errors:]
+            damaged = corrupt(rng, codeword, positions[:errors])
+            for position in erased:
+                damaged[position] = rng.randrange(256)
+            corrected = RS_DECODER.decode_block(damaged, ec_words, erasures=erased)
+            assert corrected == codeword, \
+                f"{errors} errors and {erasures} erasures in a {data_words}+{ec_words} block were not corrected"
+    print("✓ Errors and erasures are corrected up to capacity")
+
+def test_too_many_errors():
+    """Past capacity the decoder raises or returns some other valid codeword, never a broken one"""
+    rng = random.Random(3)
+    for data_words, ec_words in block_sizes():
+        codeword = random_codeword(rng, data_words, ec_words)
+        damaged = corrupt(rng, codeword, rng.sample(range(len(codeword)), ec_words // 2 + 1))
+        try:
+            corrected = RS_DECODER.decode_block(damaged, ec_words)
+        except ReedSolomonError:
+            continue
+        assert RS_DECODER.verify_block(corrected, ec_words), \
+            f"Too many errors in a {data_words}+{ec_words} block gave an invalid codeword"
+    print("✓ Too many errors are never silently miscorrected into an invalid codeword")
+
+def test_verify():
+    """verify_block and verify_blocks accept valid codewords and reject damaged ones"""
+    rng = random.Random(4)
+    np = load_numpy()
+    for data_words, ec_words in block_sizes():
+        codewords = [random_codeword(rng, data_words, ec_words) for _ in range(4)]
+        damaged = [corrupt(rng, codeword, [rng.randrange(len(codeword))]) for codeword in codewords]
+        assert all(RS_DECODER.verify_block(codeword, ec_words) for codeword in codewords), \
+            f"verify_block rejects a valid {data_words}+{ec_words} block"
+        assert not any(RS_DECODER.verify_block(codeword, ec_words) for codeword in damaged), \
+            f"verify_block accepts a damaged {data_words}+{ec_words} block"
+        if np is not None:
+            valid = RS_DECODER.verify_blocks(np.array(codewords + damaged, dtype=np.uint8), ec_words).tolist()
+            assert valid == [True] * 4 + [False] * 4, f"verify_blocks is wrong for {data_words}+{ec_words} blocks: {valid}"
+    print("✓ verify_block and verify_blocks tell valid and damaged blocks apart")
+
+if __name__ == "__main__":
+    test_errors()
+    test_errors_and_erasures()
+    test_too_many_errors()
+    test_verify()
@@ -0,0 +1,181 @@
+import itertools
+import random
+import warnings
+
+from qrgen import QRGenerator
+from qrgen.encoders import ALPHANUM, SEGMENT_ENCODERS, KanjiEncoder, is_kanji, plan_segments
+from qrgen.reedsolomon import get_codeword_capacity
+
+# Character count field widths for versions 1-9, 10-26 and 27-40, by mode indicator
+COUNT_BITS = {
+    0b0001: (10, 12, 14),
+    0b0010: (9, 11, 13),
+    0b0100: (8, 16, 16),
+    0b1000: (8, 10, 12),
+}
+
+class StrictParseError(Exception):
+    pass
+
+def strict_parse(bits: str, version: int) -> str:
+    """
+    Read the data codewords the way the spec lays them out: segments, a 0000 terminator
+    (or fewer than 4 bits left), zero bits up to a byte boundary, then EC 11 EC 11 ...
+    Anything else is an error.
+    """
+    size_class = 0 if version <= 9 else 1 if version <= 26 else 2
+    pos = 0
+    text = []
+    while True:
+        if len(bits) - pos < 4:
+            pos = len(bits)
+            break
+        mode = int(bits[pos:pos + 4], 2)
+        pos += 4
+        if mode == 0:
+            break
+        if mode not in COUNT_BITS:
+            raise StrictParseError(f'Bad mode indicator {mode:04b} at bit {pos - 4}')
+        width = COUNT_BITS[mode][size_class]
+        if len(bits) - pos < width:
+            raise StrictParseError(f'Count field cut off at bit {pos}')
+        count = int(bits[pos:pos + width], 2)
+        pos += width
+        if mode == 0b0001:
+            for i in range(0, count, 3):
+                digits = min(3, count - i)
+                width = 3 * digits + 1
+                text.append(f'{int(bits[pos:pos + width], 2):0{digits}d}')
+                pos += width
+        elif mode == 0b0010:
+            for i in range(0, count, 2):
+                if count - i >= 2:
+                    first, second = divmod(int(bits[pos:pos + 11], 2), 45)
+                    text.append(ALPHANUM[first] + ALPHANUM[second])
+                    pos += 11
+                else:
+                    text.append(ALPHANUM[int(bits[pos:pos + 6], 2)])
+                    pos += 6
+        elif mode == 0b0100:
+            data = bytes(int(bits[pos + 8 * i:pos + 8 * i + 8], 2) for i in range(count))
+            text.append(data.decode('utf-8'))
+            pos += 8 * count
+        else:
+            sjis = bytearray()
+            for i in range(count):
+                high, low = divmod(int(bits[pos:pos + 13], 2), 0xC0)
+                code = (high << 8) | low
+                code += 0x8140 if code + 0x8140 <= 0x9FFC else 0xC140
+                sjis += code.to_bytes(2, 'big')
+                pos += 13
+            text.append(sjis.decode('shift_jis'))
+        if pos > len(bits):
+            raise StrictParseError('Segment runs past the end of the data')
+    # Zero bits up to the byte boundary, then the pad codewords
+    fill = -pos % 8
+    if '1' in bits[pos:pos + fill]:
+        raise StrictParseError(f'Non zero fill bits at bit {pos}')
+    pos += fill
+    for i, start in enumerate(range(pos, len(bits), 8)):
+        if bits[start:start + 8] != ('11101100', '00010001')[i % 2]:
+            raise StrictParseError(f'Bad pad codeword at bit {start}')
+    return ''.join(text)
+
+def random_payload(rng: random.Random) -> str:
+    kind = rng.choice(['numeric', 'alphanumeric', 'mixed'])
+    if kind == 'numeric':
+        return ''.join(rng.choice('0123456789') for _ in range(rng.randint(1, 60)))
+    if kind == 'alphanumeric':
+        return ''.join(rng.choice(ALPHANUM) for _ in range(rng.randint(1, 50)))
+    parts = []
+    for _ in range(rng.randint(2, 6)):
+        charset = rng.choice(['0123456789', ALPHANUM, 'abcdefghijklmnop@#', '漢字日本'])
+        parts.append(''.join(rng.choice(charset) for _ in range(rng.randint(1, 15))))
+    return ''.join(parts)
+
+def payloads():
+    rng = random.Random(2024)
+    return ['1234567', 'HELLO WORLD', '01234567890123456789ABCDEF', '日本a1'] + [random_payload(rng) for _ in range(400)]
+
+def data_bits(qr: QRGenerator) -> str:
+    stream = qr._pre_process_data()
+    return format(stream.to_int(), f'0{len(stream)}b')
+
+def test_strict_parse_auto_version():
+    """Every payload fills its symbol exactly and parses back with the strict parser at every EC level"""
+    count = 0
+    for payload in payloads():
+        for ec_level in 'LMQH':
+            try:
+                qr = QRGenerator(data=payload, version='auto', ec_level=ec_level)
+            except ValueError:
+                continue
+            bits = data_bits(qr)
+            capacity = get_codeword_capacity(qr.version, ec_level) * 8
+            assert len(bits) == capacity, f"{payload!r} v{qr.version}-{ec_level}: {len(bits)} bits, capacity is {capacity}"
+            assert strict_parse(bits, qr.version) == payload, f"{payload!r} v{qr.version}-{ec_level} parsed differently"
+            count += 1
+    print(f"✓ {count} symbols parse strictly")
+
+def test_strict_parse_explicit_version():
+    """Explicit versions leave room for a full terminator plus zero fill"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for version in (1, 10, 27):
+            for payload in ('1234567', 'AB1', '12345678901234'):
+                qr = QRGenerator(data=payload, version=version, ec_level='L')
+                assert strict_parse(data_bits(qr), version) == payload, f"{payload!r} v{version}-L parsed differently"
+    print("✓ Explicit versions parse strictly")
+
+def brute_force_bits(text: str, version: int) -> int:
+    """Smallest encoded length over every way of giving each character a mode"""
+    lengths = {}
+
+    def segment_bits(encoder, segment):
+        key = (encoder, segment)
+        if key not in lengths:
+            # KanjiEncoder doesn't check its input, plan_segments only gives it is_kanji characters
+            if encoder is KanjiEncoder and not all(map(is_kanji, segment)):
+                lengths[key] = None
+            else:
+                try:
+                    lengths[key] = len(encoder(segment).encode(qr_version=version))
+                except ValueError:
+                    lengths[key] = None
+        return lengths[key]
+
+    best = None
+    for modes in itertools.product(SEGMENT_ENCODERS, repeat=len(text)):
+        total = 0
+        start = 0
+        for i in range(1, len(text) + 1):
+            if i == len(text) or modes[i] is not modes[start]:
+                bits = segment_bits(modes[start], text[start:i])
+                if bits is None:
+                    break
+                total += bits
+                start = i
+        else:
+            if best is None or total < best:
+                best = total
+    return best
+
+def test_plan_is_optimal():
+    """plan_segments finds the shortest segmentation, and its length is what the segments encode to"""
+    rng = random.Random(5)
+    charset = '0123456789AZ $:az@漢字'
+    for _ in range(150):
+        text = ''.join(rng.choice(charset) for _ in range(rng.randint(1, 6)))
+        for version in (1, 10, 27):
+            plan, bits = plan_segments(text, version)
+            encoded = sum(len(encoder(segment).encode(qr_version=version)) for encoder, segment in plan)
+            assert encoded == bits, f"{text!r} v{version}: plan says {bits} bits, segments encode to {encoded}"
+            assert ''.join(segment for _, segment in plan) == text
+            best = brute_force_bits(text, version)
+            assert bits == best, f"{text!r} v{version}: plan takes {bits} bits, brute force finds {best}"
+    print("✓ Segment plans are optimal")
+
+if __name__ == "__main__":
+    test_strict_parse_auto_version()
+    test_strict_parse_explicit_version()
+    test_plan_is_optimal()
@@ -0,0 +1,89 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from qrgen import QRGenerator, StructuredAppend, decode_modules, verify_symbol
+from qrgen.reedsolomon import get_codeword_capacity
+from qrgen.structured_append import MAX_SYMBOLS, parity_byte, split_data
+
+def fits(part, index, count, parity, ec_level, max_version):
+    """Whether one part of a count symbol sequence fits in max_version"""
+    try:
+        version = QRGenerator(data=part, version='auto', ec_level=ec_level,
+                              structured_append=(index, count, parity)).version
+    except ValueError:
+        return False
+    return version <= max_version
+
+def decode_sequence(sequence: StructuredAppend):
+    with ThreadPoolExecutor() as executor:
+        symbols = sequence.generate(executor=executor)
+    return symbols, [decode_modules(symbol.modules) for symbol in symbols]
+
+def test_fewest_parts():
+    """A payload too big for one symbol is split into the fewest parts that fit max_version"""
+    for payload, ec_level, max_version in (('https://example.com/' + 'abcdefgh' * 20, 'M', 5),
+                                           (bytes(range(256)) * 3, 'L', 10),
+                                           ('0123456789' * 90, 'H', 7)):
+        sequence = StructuredAppend(payload, ec_level=ec_level, max_version=max_version)
+        count = len(sequence.parts)
+        parity = parity_byte(payload)
+        assert 1 < count <= MAX_SYMBOLS, f"{count} parts for a {len(payload)} long payload"
+        assert all(version <= max_version for version in sequence.versions), sequence.versions
+        # One part fewer doesn't fit
+        fewer = split_data(payload, count - 1)
+        assert not all(fits(part, index, count - 1, parity, ec_level, max_version)
+                       for index, part in enumerate(fewer)), f"{count - 1} parts would have fit"
+    print("✓ Payloads are split into the fewest parts")
+
+def test_round_trip():
+    """Every symbol decodes to its header, and the parts join back into the payload"""
+    for payload in ('https://example.com/' + 'abcdefgh' * 20, bytes(range(256)) * 2):
+        sequence = StructuredAppend(payload, ec_level='M', max_version=6)
+        symbols, decoded = decode_sequence(sequence)
+        count = len(symbols)
+        assert count > 1
+        for index, (symbol, result) in enumerate(zip(symbols, decoded)):
+            assert result.structured_append == (index, count, parity_byte(payload)), result.structured_append
+            assert verify_symbol(symbol), f"Symbol {index} doesn't verify"
+        if isinstance(payload, str):
+            assert ''.join(result.text for result in decoded) == payload
+        else:
+            assert b''.join(result.raw for result in decoded) == payload
+    print("✓ Structured append symbols decode and join back")
+
+def test_multibyte_characters():
+    """Strings are split on characters, every part is valid utf-8 on its own"""
+    payload = '日本語のテキスト、éàü and ascii ' * 12
+    sequence = StructuredAppend(payload, ec_level='L', max_version=5)
+    assert len(sequence.parts) > 1
+    _, decoded = decode_sequence(sequence)
+    for result in decoded:
+        # .text decodes every byte segment as utf-8, a split character would raise here
+        result.raw.decode('utf-8')
+    assert ''.join(result.text for result in decoded) == payload
+    print("✓ Multi-byte characters are never split")
+
+def test_too_long():
+    """More than 16 full symbols of data raises ValueError"""
+    capacity = get_codeword_capacity(2, 'L')
+    with pytest.raises(ValueError):
+        StructuredAppend(b'\xff' * (MAX_SYMBOLS * capacity + 1), ec_level='L', max_version=2)
+    print("✓ Payloads over 16 symbols are rejected")
+
+def test_create_image():
+    """The strip holds every symbol side by side"""
+    sequence = StructuredAppend('https://example.com/' + 'x' * 60, ec_level='M', max_version=2, module_size=2)
+    with ThreadPoolExecutor() as executor:
+        symbols = sequence.generate(executor=executor)
+    strip = sequence.create_image(spacing=5)
+    widths = [(symbol.size + 2 * symbol.padding) * 2 for symbol in symbols]
+    assert strip.size == (sum(widths) + 5 * (len(symbols) - 1), max(widths)), strip.size
+    print("✓ Structured append strip image")
+
+if __name__ == "__main__":
+    test_fewest_parts()
+    test_round_trip()
+    test_multibyte_characters()
+    test_too_long()
+    test_create_image()
@@ -0,0 +1,43 @@
+import sys
+
+from qrgen import QRGenerator
+from qrgen.templates import TemplateCache
+from qrgen.utils import load_numpy
+
+def test_cache_info():
+    """get counts hits and misses, preload counts neither, and there's no size bound"""
+    cache = TemplateCache(QRGenerator.build_template)
+    cache.preload([1, 2])
+    assert cache.cache_info() == (0, 0, None, 2), cache.cache_info()
+    cache.get(1)
+    cache.get(3)
+    cache.get(3)
+    assert cache.cache_info() == (2, 1, None, 3), cache.cache_info()
+    cache.clear()
+    assert cache.cache_info() == (0, 0, None, 0), cache.cache_info()
+    print("✓ TemplateCache.cache_info counts get calls only")
+
+def test_nbytes_counts_mask_caches():
+    """The mask flips, words, arrays and planes built on first use all show up in nbytes"""
+    cache = TemplateCache(QRGenerator.build_template)
+    template = cache.get(40)
+    before = template.nbytes()
+    template.mask_flips(0)
+    flips = template.nbytes()
+    # One list of columns per row for each of the 8 masks, at least an empty list each
+    assert flips - before >= 8 * template.size * sys.getsizeof([]), (before, flips)
+    template.mask_words(0)
+    words = template.nbytes()
+    # 8 masks of 2 * size words, each at least a one digit int
+    assert words - flips >= 8 * 2 * template.size * sys.getsizeof(1), (flips, words)
+    if load_numpy() is not None:
+        template.mask_planes()
+        planes = template.nbytes()
+        modules, data = template.as_arrays()
+        assert planes - words == template.planes.nbytes + modules.nbytes + data.nbytes, (words, planes)
+    assert cache.memory_footprint() == template.nbytes()
+    print(f"✓ nbytes counts the mask caches ({before} bytes bare, {template.nbytes()} with every cache)")
+
+if __name__ == "__main__":
+    test_cache_info()
+    test_nbytes_counts_mask_caches()